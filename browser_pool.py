@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+import logging
+import queue
+import threading
+from typing import Dict, Any, Callable, Optional
+from urllib.parse import urlsplit
+
+import undetected_chromedriver as uc
+import utils
+
+# Recycle a browser after this many checkouts to keep memory use bounded
+MAX_USES_PER_INSTANCE = 50
+
+# Adds dns-prefetch/preconnect hints so DNS, TCP and TLS to the target origin
+# are set up before the first real navigation
+PREWARM_SCRIPT = """
+for (const rel of ['dns-prefetch', 'preconnect']) {
+    const link = document.createElement('link');
+    link.rel = rel;
+    link.href = arguments[0];
+    (document.head || document.documentElement).appendChild(link);
+}
+"""
+
+# Clears web storage for the current origin (ignored where storage is unavailable)
+CLEAR_STORAGE_SCRIPT = """
+try {
+    window.localStorage.clear();
+    window.sessionStorage.clear();
+} catch (e) {}
+"""
+
+class BrowserPool:
+    """
+    Pool of reusable WebDriver instances.
+
+    Browsers are created lazily (up to the pool size), reset between uses and
+    replaced after MAX_USES_PER_INSTANCE checkouts or when released as broken.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        logger: logging.Logger,
+        size: int = 1,
+        max_uses: int = MAX_USES_PER_INSTANCE,
+        warm_url: Optional[str] = None
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            config: Configuration dictionary passed to utils.setup_driver
+            logger: Logger instance
+            size: Maximum number of browsers alive at the same time (always 1
+                  when the config sets "user_data_dir")
+            max_uses: Number of checkouts before a browser is replaced
+            warm_url: URL whose origin new browsers connect to ahead of time
+        """
+        self.config = config
+        self.logger = logger
+        self.size = max(1, size)
+        if self.size > 1 and config.get("user_data_dir"):
+            # A Chrome profile can only be open in one browser at a time
+            logger.warning(f"user_data_dir is set, limiting the browser pool to 1 browser "
+                           f"instead of {self.size}")
+            self.size = 1
+        self.max_uses = max_uses
+        self.warm_url = warm_url
+        self._idle = queue.Queue()
+        self._live = {}
+        self._use_counts = {}
+        self._slots_used = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self) -> uc.Chrome:
+        """
+        Check out a browser, creating one if the pool is not yet full.
+
+        Blocks until a browser is free when all of them are in use.
+
+        Returns:
+            WebDriver instance
+        """
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+                break
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_create = self._slots_used < self.size
+                if can_create:
+                    # Reserve the slot before the (slow) browser startup
+                    self._slots_used += 1
+            if can_create:
+                driver = self._create_driver()
+                break
+
+            # Poll so a slot freed by a discarded browser is noticed
+            try:
+                driver = self._idle.get(timeout=1)
+                break
+            except queue.Empty:
+                continue
+
+        with self._lock:
+            self._use_counts[id(driver)] += 1
+        return driver
+
+    def release(self, driver: Optional[uc.Chrome], discard: bool = False) -> None:
+        """
+        Return a browser to the pool.
+
+        Args:
+            driver: WebDriver instance previously returned by acquire()
+            discard: Quit the browser instead of reusing it (e.g. after an error)
+        """
+        if driver is None:
+            return
+
+        if discard or self._closed or self._use_counts.get(id(driver), 0) >= self.max_uses:
+            self._dispose(driver)
+            return
+
+        try:
+            self._reset(driver)
+        except Exception as e:
+            self.logger.warning(f"Error resetting browser, replacing it: {str(e)}")
+            self._dispose(driver)
+            return
+
+        self._idle.put(driver)
+
+    def discard_idle(self) -> None:
+        """Quit the browsers not currently checked out, so the next acquire() starts fresh."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._dispose(driver)
+
+    def shutdown(self) -> None:
+        """Quit every browser owned by the pool."""
+        self._closed = True
+        with self._lock:
+            drivers = list(self._live.values())
+        for driver in drivers:
+            self._dispose(driver)
+
+    def _create_driver(self) -> uc.Chrome:
+        """Start a new browser and register it with the pool."""
+        try:
+            driver = utils.setup_driver(self.config, self.logger)
+        except Exception:
+            with self._lock:
+                self._slots_used -= 1
+            raise
+
+        with self._lock:
+            self._live[id(driver)] = driver
+            self._use_counts[id(driver)] = 0
+        
+        if self.warm_url:
+            self._prewarm(driver)
+        return driver
+
+    def _prewarm(self, driver: uc.Chrome) -> None:
+        """Resolve and connect to the target origin before it is first loaded."""
+        parts = urlsplit(self.warm_url)
+        if not parts.scheme or not parts.netloc:
+            return
+        
+        try:
+            driver.get("about:blank")
+            driver.execute_script(PREWARM_SCRIPT, f"{parts.scheme}://{parts.netloc}")
+        except Exception as e:
+            self.logger.debug(f"Could not pre-warm connection to {parts.netloc}: {str(e)}")
+
+    def _reset(self, driver: uc.Chrome) -> None:
+        """Clear per-use browser state so the next user starts clean."""
+        # Web storage is per origin, so clear it before leaving the current page
+        driver.execute_script(CLEAR_STORAGE_SCRIPT)
+        # One CDP call clears cookies for every domain, not just the current page's
+        if utils.send_cdp_command(driver, "Network.clearBrowserCookies", logger=self.logger) is None:
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def _dispose(self, driver: uc.Chrome) -> None:
+        """Quit a browser and forget about it."""
+        with self._lock:
+            if self._live.pop(id(driver), None) is not None:
+                self._slots_used -= 1
+            self._use_counts.pop(id(driver), None)
+        try:
+            driver.quit()
+            self.logger.info("Browser closed successfully")
+        except Exception as e:
+            self.logger.warning(f"Error closing browser: {str(e)}")
+
+def acquire_driver(context: Dict[str, Any], create: Callable[[], uc.Chrome]) -> uc.Chrome:
+    """
+    Check a browser out of the context's shared pool, or create one.
+    
+    Args:
+        context: Application context, optionally holding a "driver_pool"
+        create: Factory used when no pool is available
+        
+    Returns:
+        WebDriver instance
+    """
+    pool = context.get("driver_pool")
+    if pool:
+        return pool.acquire()
+    return create()
+
+def release_driver(context: Dict[str, Any], driver: Optional[uc.Chrome], logger: logging.Logger,
+                   discard: bool = False) -> None:
+    """
+    Return a browser obtained with acquire_driver, quitting it if it is not pooled.
+    
+    Args:
+        context: Application context, optionally holding a "driver_pool"
+        driver: WebDriver instance (None is ignored)
+        logger: Logger instance
+        discard: Quit a pooled browser instead of reusing it
+    """
+    if driver is None:
+        return
+    
+    pool = context.get("driver_pool")
+    if pool:
+        pool.release(driver, discard=discard)
+        return
+    
+    driver.quit()
+    logger.info("Browser closed")
@@ -2,19 +2,22 @@
 import json
 import logging
 import argparse
+import copy
+import functools
+import importlib
 import os
 import sys
-from datetime import datetime
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Mapping, Optional, Tuple
 
-# Import mode handlers
-from mode_submit import run_submit_mode
-from mode_sql_inject import run_sql_injection_mode
-from mode_xss import run_xss_mode
-from mode_csrf import run_csrf_mode
-from mode_headers import run_headers_mode
-from mode_comprehensive import run_comprehensive_mode
-import utils
+# orjson is optional; it parses noticeably faster than the stdlib json module
+try:
+    import orjson
+    _json_loads = orjson.loads
+    JSON_DECODE_ERRORS = (json.JSONDecodeError, orjson.JSONDecodeError)
+except ImportError:
+    _json_loads = json.loads
+    JSON_DECODE_ERRORS = (json.JSONDecodeError,)
 
 # Configure logging
 logging.basicConfig(
@@ -31,10 +34,87 @@ FORM_CONFIG_DATA = None
 RANDOM_DATA = None
 VERBOSITY = "balanced"
 
-# Default configuration file path
-CONFIG_FILE_PATH = "config.json"
+# Mode name -> (module, handler function); modules are imported on demand so
+# unused modes (and Selenium, for --help) are never loaded
+MODES = {
+    "submit": ("mode_submit", "run_submit_mode"),
+    "sql_inject": ("mode_sql_inject", "run_sql_injection_mode"),
+    "xss": ("mode_xss", "run_xss_mode"),
+    "csrf": ("mode_csrf", "run_csrf_mode"),
+    "headers": ("mode_headers", "run_headers_mode"),
+    "comprehensive": ("mode_comprehensive", "run_comprehensive_mode"),
+}
+
+# Default configuration file paths, in order of preference
+DEFAULT_CONFIG_FILES = ("config.json", "form_config.json")
 # Try to get alternative config file path from environment
-CONFIG_FILE_PATH = os.environ.get("CONFIG", CONFIG_FILE_PATH)
+CONFIG_FILE_PATH = os.environ.get("CONFIG") or next(
+    (path for path in DEFAULT_CONFIG_FILES if os.path.exists(path)),
+    DEFAULT_CONFIG_FILES[0]
+)
+
+@dataclass(frozen=True)
+class EnvOverrides:
+    """Configuration overrides taken from environment variables."""
+    mode: Optional[str] = None
+    verbosity: Optional[str] = None
+    url: Optional[str] = None
+    min_interval: Optional[int] = None
+    max_interval: Optional[int] = None
+    report_format: Optional[str] = None
+    report_dir: Optional[str] = None
+    security_tests: Optional[Tuple[str, ...]] = None
+
+def _resolve_int_env(env: Mapping[str, str], name: str) -> Optional[int]:
+    """
+    Read an integer environment variable.
+    
+    Args:
+        env: Environment mapping
+        name: Environment variable name
+    
+    Returns:
+        Parsed value, or None if unset or invalid
+    """
+    value = env.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("Invalid %s environment variable, using default", name)
+        return None
+
+@functools.lru_cache(maxsize=1)
+def get_env_overrides() -> EnvOverrides:
+    """
+    Read and validate all override environment variables once.
+    
+    Returns:
+        EnvOverrides instance
+    """
+    env = os.environ
+    
+    mode = env.get("MODE")
+    verbosity = env.get("VERBOSITY")
+    
+    security_tests = None
+    tests_env = env.get("SECURITY_TESTS")
+    if tests_env:
+        tests = tuple(tests_env.split(","))
+        if all(test in ["sql", "xss", "csrf", "headers"] for test in tests):
+            security_tests = tests
+    
+    return EnvOverrides(
+        mode=mode if mode in MODES else None,
+        verbosity=verbosity if verbosity in ["minimal", "balanced", "verbose"] else None,
+        url=env.get("TARGET_URL") or None,
+        min_interval=_resolve_int_env(env, "MIN_INTERVAL"),
+        max_interval=_resolve_int_env(env, "MAX_INTERVAL"),
+        report_format=env.get("REPORT_FORMAT") or None,
+        report_dir=env.get("REPORT_DIR") or None,
+        security_tests=security_tests,
+    )
 
 def parse_arguments() -> argparse.Namespace:
     """Parse command line arguments."""
@@ -46,8 +126,8 @@ def parse_arguments() -> argparse.Namespace:
     )
     parser.add_argument(
         "--mode", "-m",
-        choices=["submit", "sql_inject", "xss", "csrf", "headers", "comprehensive"],
-        help="Operation mode (submit, sql_inject, xss, csrf, headers, or comprehensive)"
+        choices=list(MODES),
+        help=f"Operation mode ({', '.join(MODES)})"
     )
     parser.add_argument(
         "--verbosity", "-v",
@@ -86,6 +166,21 @@ def parse_arguments() -> argparse.Namespace:
     
     return parser.parse_args()
 
+@functools.lru_cache(maxsize=4)
+def _load_all_configs(path: str, mtime: float) -> Dict[str, Any]:
+    """
+    Parse a configuration file, memoized on its path and modification time.
+    
+    Args:
+        path: Path to the configuration file
+        mtime: Modification time of the file (part of the cache key only)
+    
+    Returns:
+        Dict of all configurations in the file
+    """
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
 def load_config(config_name: Optional[str] = None) -> Dict[str, Any]:
     """
     Load configuration from config.json.
@@ -103,28 +198,62 @@ def load_config(config_name: Optional[str] = None) -> Dict[str, Any]:
     
     # Get absolute path to the config file for better logging
     abs_config_path = os.path.abspath(CONFIG_FILE_PATH)
-    logger.info(f"Loading configuration '{config_name}' from file: {abs_config_path}")
+    logger.info("Loading configuration '%s' from file: %s", config_name, abs_config_path)
     
     try:
-        with open(CONFIG_FILE_PATH, "r") as f:
-            all_configs = json.load(f)
+        all_configs = _load_all_configs(CONFIG_FILE_PATH, os.path.getmtime(CONFIG_FILE_PATH))
             
         if config_name not in all_configs:
-            logger.error(f"Configuration '{config_name}' not found in {CONFIG_FILE_PATH}")
-            logger.info(f"Available configurations: {', '.join(all_configs.keys())}")
+            logger.error("Configuration '%s' not found in %s", config_name, CONFIG_FILE_PATH)
+            logger.info("Available configurations: %s", ", ".join(all_configs.keys()))
             sys.exit(1)
             
-        config = all_configs[config_name]
-        logger.info(f"Loaded configuration: {config_name}")
+        # Copy so command-line overrides don't leak into the cached file contents
+        config = copy.deepcopy(all_configs[config_name])
+        logger.info("Loaded configuration: %s", config_name)
         return config
     
     except FileNotFoundError:
-        logger.error(f"Configuration file not found: {CONFIG_FILE_PATH}")
+        logger.error("Configuration file not found: %s", CONFIG_FILE_PATH)
         sys.exit(1)
-    except json.JSONDecodeError:
-        logger.error(f"Invalid JSON in configuration file: {CONFIG_FILE_PATH}")
+    except JSON_DECODE_ERRORS:
+        logger.error("Invalid JSON in configuration file: %s", CONFIG_FILE_PATH)
         sys.exit(1)
 
+def _pick(cli_value: Any, env_value: Any, config: Dict[str, Any], key: str, default: Any = None) -> Any:
+    """
+    Resolve a setting by precedence: CLI args > Environment variable > Config file > Default.
+    
+    Args:
+        cli_value: Value from the command line (None if not given)
+        env_value: Value from the environment (None if not set)
+        config: Configuration dictionary holding the file value
+        key: Key of the setting in the configuration
+        default: Value used when no source provides one
+    
+    Returns:
+        Resolved value
+    """
+    if cli_value is not None:
+        return cli_value
+    if env_value is not None:
+        return env_value
+    return config.get(key, default)
+
+def _override(target: Dict[str, Any], key: str, cli_value: Any, env_value: Any) -> None:
+    """
+    Store a CLI or environment override in a configuration section.
+    
+    Args:
+        target: Configuration section to update
+        key: Key of the setting
+        cli_value: Value from the command line (None if not given)
+        env_value: Value from the environment (None if not set)
+    """
+    value = _pick(cli_value, env_value, target, key)
+    if value is not None:
+        target[key] = value
+
 def get_operation_mode(args: argparse.Namespace, config: Dict[str, Any]) -> str:
     """
     Determine the operation mode based on command-line args, environment vars, and config.
@@ -136,15 +265,7 @@ def get_operation_mode(args: argparse.Namespace, config: Dict[str, Any]) -> str:
     Returns:
         Operation mode string
     """
-    # Priority: CLI args > Environment variable > Config file > Default
-    if args.mode:
-        return args.mode
-    
-    env_mode = os.environ.get("MODE")
-    if env_mode in ["submit", "sql_inject", "xss", "csrf", "headers", "comprehensive"]:
-        return env_mode
-    
-    return config.get("mode", "submit")
+    return _pick(args.mode, get_env_overrides().mode, config, "mode", "submit")
 
 def get_verbosity(args: argparse.Namespace, config: Dict[str, Any]) -> str:
     """
@@ -157,15 +278,7 @@ def get_verbosity(args: argparse.Namespace, config: Dict[str, Any]) -> str:
     Returns:
         Verbosity level string
     """
-    # Priority: CLI args > Environment variable > Config file > Default
-    if args.verbosity:
-        return args.verbosity
-    
-    env_verbosity = os.environ.get("VERBOSITY")
-    if env_verbosity in ["minimal", "balanced", "verbose"]:
-        return env_verbosity
-    
-    return config.get("verbosity", "balanced")
+    return _pick(args.verbosity, get_env_overrides().verbosity, config, "verbosity", "balanced")
 
 def configure_logging(verbosity: str) -> None:
     """
@@ -194,53 +307,23 @@ def apply_command_line_overrides(args: argparse.Namespace, config: Dict[str, Any
     Returns:
         Updated configuration dictionary
     """
+    env = get_env_overrides()
+    
     # Override URL if provided
-    if args.url:
-        config["url"] = args.url
-    elif os.environ.get("TARGET_URL"):
-        config["url"] = os.environ.get("TARGET_URL")
+    _override(config, "url", args.url, env.url)
     
     # Override timing settings if provided
-    if "timing" not in config:
-        config["timing"] = {}
-    
-    if args.min_interval is not None:
-        config["timing"]["min_interval"] = args.min_interval
-    elif os.environ.get("MIN_INTERVAL"):
-        try:
-            config["timing"]["min_interval"] = int(os.environ.get("MIN_INTERVAL", 300))
-        except ValueError:
-            logger.warning("Invalid MIN_INTERVAL environment variable, using default")
-    
-    if args.max_interval is not None:
-        config["timing"]["max_interval"] = args.max_interval
-    elif os.environ.get("MAX_INTERVAL"):
-        try:
-            config["timing"]["max_interval"] = int(os.environ.get("MAX_INTERVAL", 2700))
-        except ValueError:
-            logger.warning("Invalid MAX_INTERVAL environment variable, using default")
+    timing = config.setdefault("timing", {})
+    _override(timing, "min_interval", args.min_interval, env.min_interval)
+    _override(timing, "max_interval", args.max_interval, env.max_interval)
     
     # Override security testing settings if provided
     if args.report_format or args.report_dir or args.test:
-        if "comprehensive_settings" not in config:
-            config["comprehensive_settings"] = {}
-        
-        if args.report_format:
-            config["comprehensive_settings"]["report_format"] = args.report_format
-        elif os.environ.get("REPORT_FORMAT"):
-            config["comprehensive_settings"]["report_format"] = os.environ.get("REPORT_FORMAT")
-        
-        if args.report_dir:
-            config["comprehensive_settings"]["report_dir"] = args.report_dir
-        elif os.environ.get("REPORT_DIR"):
-            config["comprehensive_settings"]["report_dir"] = os.environ.get("REPORT_DIR")
-        
-        if args.test:
-            config["comprehensive_settings"]["tests"] = args.test
-        elif os.environ.get("SECURITY_TESTS"):
-            tests = os.environ.get("SECURITY_TESTS", "").split(",")
-            if all(test in ["sql", "xss", "csrf", "headers"] for test in tests):
-                config["comprehensive_settings"]["tests"] = tests
+        settings = config.setdefault("comprehensive_settings", {})
+        _override(settings, "report_format", args.report_format, env.report_format)
+        _override(settings, "report_dir", args.report_dir, env.report_dir)
+        _override(settings, "tests", args.test,
+                  list(env.security_tests) if env.security_tests else None)
     
     return config
 
@@ -270,22 +353,14 @@ def main() -> None:
     }
     
     # Run appropriate mode
-    logger.info(f"Starting Form Monkey in {mode} mode")
-    if mode == "submit":
-        run_submit_mode(context)
-    elif mode == "sql_inject":
-        run_sql_injection_mode(context)
-    elif mode == "xss":
-        run_xss_mode(context)
-    elif mode == "csrf":
-        run_csrf_mode(context)
-    elif mode == "headers":
-        run_headers_mode(context)
-    elif mode == "comprehensive":
-        run_comprehensive_mode(context)
-    else:
-        logger.error(f"Unknown mode: {mode}")
+    logger.info("Starting Form Monkey in %s mode", mode)
+    if mode not in MODES:
+        logger.error("Unknown mode: %s", mode)
         sys.exit(1)
+    
+    module_name, handler_name = MODES[mode]
+    handler = getattr(importlib.import_module(module_name), handler_name)
+    handler(context)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
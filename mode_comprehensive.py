@@ -2,17 +2,181 @@
 import logging
 import json
 import time
+import importlib
 import os
-from typing import Dict, Any, List, Optional
+import string
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import ChainMap, Counter
+from dataclasses import dataclass
+from typing import Dict, Any, List, Mapping, Optional, TextIO
 from selenium.common.exceptions import WebDriverException
 import datetime
 
-# Import all mode modules
-import mode_sql_inject
-import mode_xss
-import mode_csrf
-import mode_headers
 import security_report
+import utils
+from browser_pool import BrowserPool
+
+# Minimal HTML report written when the full report generator fails
+FALLBACK_HTML_TEMPLATE = string.Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Security Assessment Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 1000px; margin: 0 auto; padding: 20px; }
+        h1, h2, h3 { color: #2c3e50; }
+        h1 { border-bottom: 2px solid #3498db; padding-bottom: 10px; }
+        h2 { border-bottom: 1px solid #3498db; padding-bottom: 5px; margin-top: 30px; }
+    </style>
+</head>
+<body>
+    <h1>Security Assessment Report</h1>
+    <p><strong>Target URL:</strong> $url</p>
+    <p><strong>Scan Date:</strong> $scan_date</p>
+    <p><strong>Report Type:</strong> Form Security Assessment</p>
+    
+    <h2>Summary of Findings</h2>
+    <p>Due to an error in report generation, this is a simplified report.</p>
+    
+    <h2>Security Headers</h2>
+    <p>Found $missing_headers missing and $weak_headers weak security headers.</p>
+    <p>Security score: $headers_score/100 ($headers_rating)</p>
+    
+    <h2>Security Score</h2>
+    <p>Overall security score: $overall_score/100</p>
+</body>
+</html>
+""")
+
+# Shared encoder for report JSON (non-serializable values are written as strings)
+_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, default=str)
+
+# Test name -> ((module, run function), results key, settings key, label).
+# Mode modules are imported only when their test is selected.
+TEST_RUNNERS = {
+    "sql": (("mode_sql_inject", "run_sql_injection_mode"), "sql_injection_results", "sql_injection_settings", "SQL Injection Testing"),
+    "xss": (("mode_xss", "run_xss_mode"), "xss_results", "xss_settings", "XSS Testing"),
+    "csrf": (("mode_csrf", "run_csrf_mode"), "csrf_results", "csrf_settings", "CSRF Testing"),
+    "headers": (("mode_headers", "run_headers_mode"), "headers_results", None, "Security Headers Testing"),
+}
+
+# Tests that drive a browser (and so draw from the shared driver pool)
+BROWSER_TESTS = ("sql", "xss", "csrf")
+
+# Points deducted from the security score per finding of each severity
+SEVERITY_WEIGHTS = {"critical": 15, "high": 10, "medium": 5, "low": 1}
+
+# (results key, findings key, fixed severity or None to use each finding's own)
+SCORE_SOURCES = (
+    ("sql_injection_results", "sql_vulnerabilities", "critical"),
+    ("xss_results", "xss_vulnerabilities", None),
+    ("csrf_results", "csrf_vulnerabilities", None),
+    ("headers_results", "security_issues", None),
+)
+
+@dataclass(slots=True)
+class ReportInputs:
+    """Sub-results of a comprehensive run, normalized for report generation."""
+    url: str
+    sql: Dict[str, Any]
+    xss: Dict[str, Any]
+    csrf: Dict[str, Any]
+    headers: Dict[str, Any]
+    
+    @classmethod
+    def from_results(cls, url: str, results: Dict[str, Any]) -> "ReportInputs":
+        """
+        Build report inputs from raw test results.
+        
+        Missing or non-dict results (e.g. a mode that returned None) become a
+        placeholder dict, and the header results always carry a security_issues list.
+        
+        Args:
+            url: Target URL
+            results: Raw comprehensive results
+        
+        Returns:
+            ReportInputs instance
+        """
+        def section(key: str) -> Dict[str, Any]:
+            if key not in results:
+                return {}
+            value = results[key]
+            return value if isinstance(value, dict) else {"note": f"No results available for {key}"}
+        
+        headers = section("headers_results")
+        security_issues = headers.get("security_issues")
+        if not isinstance(security_issues, list):
+            headers["security_issues"] = list(security_issues) if isinstance(security_issues, (tuple, set)) else []
+        
+        return cls(
+            url=url,
+            sql=section("sql_injection_results"),
+            xss=section("xss_results"),
+            csrf=section("csrf_results"),
+            headers=headers
+        )
+    
+    def as_results(self) -> Dict[str, Any]:
+        """Return the sub-results keyed the way security_report expects them."""
+        return {
+            "sql_injection_results": self.sql,
+            "xss_results": self.xss,
+            "csrf_results": self.csrf,
+            "headers_results": self.headers
+        }
+
+def overlay_settings(config: Dict[str, Any], comprehensive_settings: Dict[str, Any],
+                     settings_key: Optional[str]) -> Mapping[str, Any]:
+    """
+    Layer test-specific settings from comprehensive_settings over the configuration.
+    
+    The sub-modes only read their configuration, so a ChainMap overlay is used
+    instead of copying the whole dictionary per test.
+    
+    Args:
+        config: Base configuration
+        comprehensive_settings: Comprehensive mode settings
+        settings_key: Key of the test's settings (e.g. "xss_settings"), or None
+    
+    Returns:
+        Configuration with the override applied (config itself if there is none)
+    """
+    if settings_key and settings_key in comprehensive_settings:
+        return ChainMap({settings_key: comprehensive_settings[settings_key]}, config)
+    return config
+
+def write_json(f: TextIO, data: Any) -> None:
+    """
+    Write data as indented JSON, streaming the encoded chunks to the file.
+    
+    Args:
+        f: Open text file
+        data: JSON-serializable data
+    """
+    for chunk in _JSON_ENCODER.iterencode(data):
+        f.write(chunk)
+
+def run_security_test(test: str, test_context: Dict[str, Any], logger: logging.Logger) -> Any:
+    """
+    Run a single security test and log how long it took.
+    
+    Args:
+        test: Test name (key of TEST_RUNNERS)
+        test_context: Application context for the test
+        logger: Logger instance
+    
+    Returns:
+        Results returned by the test's run function
+    """
+    (module_name, function_name), _, _, label = TEST_RUNNERS[test]
+    runner = getattr(importlib.import_module(module_name), function_name)
+    logger.info(f"=== Starting {label} ===")
+    start_time = time.time()
+    results = runner(test_context)
+    execution_time = time.time() - start_time
+    logger.info(f"{label} completed in {execution_time:.2f} seconds")
+    return results
 
 def run_comprehensive_mode(context: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -45,151 +209,70 @@ def run_comprehensive_mode(context: Dict[str, Any]) -> Dict[str, Any]:
     report_format = comprehensive_settings.get("report_format", "html")
     report_dir = comprehensive_settings.get("report_dir", "reports")
     
-    # Run SQL injection tests if requested
-    if "sql" in tests_to_run:
-        logger.info("=== Starting SQL Injection Testing ===")
-        sql_context = context.copy()
-        sql_context["config"] = config.copy()  # Make a copy to avoid modifying original
-        
-        # Override with specific SQL injection settings if available
-        if "sql_injection_settings" in comprehensive_settings:
-            sql_context["config"]["sql_injection_settings"] = comprehensive_settings["sql_injection_settings"]
-        
-        # Run the SQL injection tests
-        try:
-            start_time = time.time()
-            sql_results = mode_sql_inject.run_sql_injection_mode(sql_context)
-            execution_time = time.time() - start_time
-            logger.info(f"SQL Injection Testing completed in {execution_time:.2f} seconds")
-            comprehensive_results["sql_injection_results"] = sql_results
-        except WebDriverException as e:
-            logger.error(f"WebDriver error during SQL Injection Testing: {e}")
-            logger.info("Continuing with other tests despite WebDriver error")
-            comprehensive_results["sql_injection_results"] = {"error": f"WebDriver error: {str(e)}"}
-        except Exception as e:
-            logger.error(f"Error during SQL Injection Testing: {e}")
-            comprehensive_results["sql_injection_results"] = {"error": str(e)}
+    # Build a context per selected test, applying test-specific settings overrides
+    selected_tests = [test for test in TEST_RUNNERS if test in tests_to_run]
     
-    # Run XSS tests if requested
-    if "xss" in tests_to_run:
-        logger.info("=== Starting XSS Testing ===")
-        xss_context = context.copy()
-        xss_context["config"] = config.copy()
-        
-        # Override with specific XSS settings if available
-        if "xss_settings" in comprehensive_settings:
-            xss_context["config"]["xss_settings"] = comprehensive_settings["xss_settings"]
-        
-        # Run the XSS tests
-        try:
-            start_time = time.time()
-            xss_results = mode_xss.run_xss_mode(xss_context)
-            execution_time = time.time() - start_time
-            logger.info(f"XSS Testing completed in {execution_time:.2f} seconds")
-            comprehensive_results["xss_results"] = xss_results
-        except WebDriverException as e:
-            logger.error(f"WebDriver error during XSS Testing: {e}")
-            logger.info("Continuing with other tests despite WebDriver error")
-            comprehensive_results["xss_results"] = {"error": f"WebDriver error: {str(e)}"}
-        except Exception as e:
-            logger.error(f"Error during XSS Testing: {e}")
-            comprehensive_results["xss_results"] = {"error": str(e)}
+    # Browser-based tests share one pool instead of each launching and quitting Chrome.
+    # Defaults to one browser per such test so they can still run concurrently.
+    browser_tests = [test for test in selected_tests if test in BROWSER_TESTS]
+    pool_size = comprehensive_settings.get("browser_pool_size", len(browser_tests))
+    driver_pool = BrowserPool(config, logger, size=pool_size, warm_url=url)
     
-    # Run CSRF tests if requested
-    if "csrf" in tests_to_run:
-        logger.info("=== Starting CSRF Testing ===")
-        csrf_context = context.copy()
-        csrf_context["config"] = config.copy()
-        
-        # Override with specific CSRF settings if available
-        if "csrf_settings" in comprehensive_settings:
-            csrf_context["config"]["csrf_settings"] = comprehensive_settings["csrf_settings"]
-        
-        # Run the CSRF tests
-        try:
-            start_time = time.time()
-            csrf_results = mode_csrf.run_csrf_mode(csrf_context)
-            execution_time = time.time() - start_time
-            logger.info(f"CSRF Testing completed in {execution_time:.2f} seconds")
-            comprehensive_results["csrf_results"] = csrf_results
-        except WebDriverException as e:
-            logger.error(f"WebDriver error during CSRF Testing: {e}")
-            logger.info("Continuing with other tests despite WebDriver error")
-            comprehensive_results["csrf_results"] = {"error": f"WebDriver error: {str(e)}"}
-        except Exception as e:
-            logger.error(f"Error during CSRF Testing: {e}")
-            comprehensive_results["csrf_results"] = {"error": str(e)}
+    # Tests that talk HTTP directly share one pooled keep-alive session
+    http_session = utils.create_http_session(retries=config.get("http_retries", 0),
+                                             user_agent=config.get("user_agent"))
     
-    # Run header tests if requested
-    if "headers" in tests_to_run:
-        logger.info("=== Starting Security Headers Testing ===")
-        headers_context = context.copy()
-        headers_context["config"] = config.copy()
-        
-        # Run the header tests
-        try:
-            start_time = time.time()
-            headers_results = mode_headers.run_headers_mode(headers_context)
-            execution_time = time.time() - start_time
-            logger.info(f"Security Headers Testing completed in {execution_time:.2f} seconds")
-            comprehensive_results["headers_results"] = headers_results
-        except WebDriverException as e:
-            logger.error(f"WebDriver error during Headers Testing: {e}")
-            logger.info("Continuing with other tests despite WebDriver error")
-            comprehensive_results["headers_results"] = {"error": f"WebDriver error: {str(e)}"}
-        except Exception as e:
-            logger.error(f"Error during Security Headers Testing: {e}")
-            comprehensive_results["headers_results"] = {"error": str(e)}
+    test_contexts = {}
+    for test in selected_tests:
+        settings_key = TEST_RUNNERS[test][2]
+        test_context = context.copy()
+        test_context["driver_pool"] = driver_pool
+        test_context["http_session"] = http_session
+        test_context["config"] = overlay_settings(config, comprehensive_settings, settings_key)
+        test_contexts[test] = test_context
+    
+    # The tests are independent (each checks out its own browser), so run them concurrently
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, len(selected_tests))) as executor:
+            futures = {
+                executor.submit(run_security_test, test, test_contexts[test], logger): test
+                for test in selected_tests
+            }
+            for future in as_completed(futures):
+                test = futures[future]
+                _, results_key, _, label = TEST_RUNNERS[test]
+                try:
+                    comprehensive_results[results_key] = future.result()
+                except WebDriverException as e:
+                    logger.error(f"WebDriver error during {label}: {e}")
+                    logger.info("Continuing with other tests despite WebDriver error")
+                    comprehensive_results[results_key] = {"error": f"WebDriver error: {str(e)}"}
+                except Exception as e:
+                    logger.error(f"Error during {label}: {e}")
+                    comprehensive_results[results_key] = {"error": str(e)}
+    finally:
+        driver_pool.shutdown()
+        http_session.close()
     
     # Generate comprehensive report
     logger.info("=== Generating Security Report ===")
     
     try:
-        # Ensure all required fields are present in comprehensive_results
-        # Check for necessary data structures before calling generate_report
-        for test_type in ["sql_injection_results", "xss_results", "csrf_results", "headers_results"]:
-            if test_type not in comprehensive_results:
-                comprehensive_results[test_type] = {}
-            
-            # Ensure each test result has expected sub-fields to prevent NoneType errors
-            if "error" not in comprehensive_results[test_type] and not isinstance(comprehensive_results[test_type], dict):
-                comprehensive_results[test_type] = {"note": f"No results available for {test_type}"}
-                
-        # Create report directory if it doesn't exist
-        if not os.path.exists(report_dir):
-            os.makedirs(report_dir)
+        # Normalize the sub-results once; report generation reads them from here
+        inputs = ReportInputs.from_results(url, comprehensive_results)
+        comprehensive_results.update(inputs.as_results())
+        headers_content = inputs.headers
         
-        # Ensure headers_results has security_issues
-        if "headers_results" in comprehensive_results and comprehensive_results["headers_results"] is not None:
-            if "security_issues" not in comprehensive_results["headers_results"] or comprehensive_results["headers_results"]["security_issues"] is None:
-                comprehensive_results["headers_results"]["security_issues"] = []
+        # Create report directory if it doesn't exist
+        os.makedirs(report_dir, exist_ok=True)
         
         # Wrap the entire report generation in a try/except with detailed debug
         try:
-            # Debug print the headers_results content
-            headers_content = comprehensive_results.get("headers_results", {})
-            logger.debug(f"Headers results debug: {str(headers_content)[:200]}...")
-            logger.debug(f"Full headers_results keys: {list(headers_content.keys())}")
-            logger.debug(f"Headers results structure: {json.dumps(headers_content, default=str)[:500]}...")
-            
-            # Debug print security_issues
-            security_issues = headers_content.get("security_issues")
-            logger.debug(f"Security issues type: {type(security_issues)}")
-            
-            if security_issues is None:
-                logger.debug("Security issues is None - initializing empty list")
-                # Initialize it to prevent TypeError
-                comprehensive_results["headers_results"]["security_issues"] = []
-            elif not isinstance(security_issues, list):
-                logger.debug(f"Security issues is not a list, it's {type(security_issues)}")
-                # Convert to list if possible
-                try:
-                    if hasattr(security_issues, '__iter__'):
-                        comprehensive_results["headers_results"]["security_issues"] = list(security_issues)
-                    else:
-                        comprehensive_results["headers_results"]["security_issues"] = []
-                except:
-                    comprehensive_results["headers_results"]["security_issues"] = []
+            # Debug print the headers_results content (serializing it is costly, so only when enabled)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Headers results debug: {str(headers_content)[:200]}...")
+                logger.debug(f"Full headers_results keys: {list(headers_content.keys())}")
+                logger.debug(f"Headers results structure: {json.dumps(headers_content, default=str)[:500]}...")
             
             report_path = security_report.generate_report(
                 comprehensive_results,
@@ -200,11 +283,8 @@ def run_comprehensive_mode(context: Dict[str, Any]) -> Dict[str, Any]:
             logger.info(f"Security report generated at: {report_path}")
             comprehensive_results["report_path"] = report_path
         except Exception as e:
-            logger.error(f"Error in report generation: {e}")
-            # Provide detailed info about the error
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            logger.error(f"Error location: {e.__traceback__.tb_frame.f_code.co_filename}, line {e.__traceback__.tb_lineno}")
+            # The traceback (including the error location) is attached to the record
+            logger.exception("Error in report generation: %s", e)
             
             # Try to handle specific issues with security report
             if isinstance(e, TypeError) and "'NoneType' object is not iterable" in str(e):
@@ -217,40 +297,19 @@ def run_comprehensive_mode(context: Dict[str, Any]) -> Dict[str, Any]:
                     
                     # Create a simple HTML report
                     with open(os.path.join(simple_report_dir, "security_report.html"), "w") as f:
-                        f.write(f"""
-                        <!DOCTYPE html>
-                        <html>
-                        <head>
-                            <title>Security Assessment Report</title>
-                            <style>
-                                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 1000px; margin: 0 auto; padding: 20px; }}
-                                h1, h2, h3 {{ color: #2c3e50; }}
-                                h1 {{ border-bottom: 2px solid #3498db; padding-bottom: 10px; }}
-                                h2 {{ border-bottom: 1px solid #3498db; padding-bottom: 5px; margin-top: 30px; }}
-                            </style>
-                        </head>
-                        <body>
-                            <h1>Security Assessment Report</h1>
-                            <p><strong>Target URL:</strong> {url}</p>
-                            <p><strong>Scan Date:</strong> {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                            <p><strong>Report Type:</strong> Form Security Assessment</p>
-                            
-                            <h2>Summary of Findings</h2>
-                            <p>Due to an error in report generation, this is a simplified report.</p>
-                            
-                            <h2>Security Headers</h2>
-                            <p>Found {headers_content.get('missing_headers', 0)} missing and {headers_content.get('weak_headers', 0)} weak security headers.</p>
-                            <p>Security score: {headers_content.get('security_score', 'N/A')}/100 ({headers_content.get('security_rating', 'unknown')})</p>
-                            
-                            <h2>Security Score</h2>
-                            <p>Overall security score: {comprehensive_results.get('security_score', 0)}/100</p>
-                        </body>
-                        </html>
-                        """)
+                        f.write(FALLBACK_HTML_TEMPLATE.substitute(
+                            url=inputs.url,
+                            scan_date=datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                            missing_headers=headers_content.get('missing_headers', 0),
+                            weak_headers=headers_content.get('weak_headers', 0),
+                            headers_score=headers_content.get('security_score', 'N/A'),
+                            headers_rating=headers_content.get('security_rating', 'unknown'),
+                            overall_score=comprehensive_results.get('security_score', 0)
+                        ))
                     
                     # Create a simple JSON report
                     with open(os.path.join(simple_report_dir, "security_report.json"), "w") as f:
-                        json.dump({
+                        write_json(f, {
                             "meta": {
                                 "target_url": url,
                                 "scan_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -265,7 +324,7 @@ def run_comprehensive_mode(context: Dict[str, Any]) -> Dict[str, Any]:
                                 "overall_score": comprehensive_results.get('security_score', 0)
                             },
                             "error": str(e)
-                        }, f, indent=2)
+                        })
                     
                     comprehensive_results["report_path"] = simple_report_dir
                     logger.info(f"Simple security report generated at: {simple_report_dir}")
@@ -301,63 +360,22 @@ def calculate_security_score(results: Dict[str, Any]) -> int:
         Security score from 0-100
     """
     # Start with full score and deduct points for issues
-    score = 100
-    
-    # Count issues by severity
-    severity_counts = {
-        "critical": 0,
-        "high": 0,
-        "medium": 0,
-        "low": 0
-    }
-    
-    # Initialize result dictionaries if they don't exist
     if not results:
-        return score
-    
-    # SQL injection vulnerabilities (critical)
-    sql_results = results.get("sql_injection_results", {})
-    if sql_results is not None:
-        sql_vulns = sql_results.get("sql_vulnerabilities", [])
-        if sql_vulns is not None:
-            severity_counts["critical"] += len(sql_vulns)
+        return 100
     
-    # XSS vulnerabilities (critical)
-    xss_results = results.get("xss_results", {})
-    if xss_results is not None:
-        xss_vulns = xss_results.get("xss_vulnerabilities", [])
-        if xss_vulns is not None:
-            severity_counts["critical"] += len(xss_vulns)
-    
-    # CSRF vulnerabilities (by severity)
-    csrf_results = results.get("csrf_results", {})
-    if csrf_results is not None:
-        csrf_vulns = csrf_results.get("csrf_vulnerabilities", [])
-        if csrf_vulns is not None:
-            for vuln in csrf_vulns:
-                severity = vuln.get("severity", "medium")
-                if severity in severity_counts:
-                    severity_counts[severity] += 1
-    
-    # Header issues (by severity)
-    headers_results = results.get("headers_results", {})
-    if headers_results is not None:
-        security_issues = headers_results.get("security_issues", [])
-        if security_issues is not None:
-            for issue in security_issues:
-                severity = issue.get("severity", "medium")
-                if severity in severity_counts:
-                    severity_counts[severity] += 1
+    # Count issues by severity
+    severity_counts = Counter()
+    for results_key, findings_key, fixed_severity in SCORE_SOURCES:
+        findings = (results.get(results_key) or {}).get(findings_key) or []
+        if fixed_severity:
+            severity_counts[fixed_severity] += len(findings)
+        else:
+            severity_counts.update(
+                severity for severity in (finding.get("severity", "medium") for finding in findings)
+                if severity in SEVERITY_WEIGHTS
+            )
     
-    # Deduct points based on severity
-    # Critical: -15 points each
-    # High: -10 points each
-    # Medium: -5 points each
-    # Low: -1 point each
-    score -= severity_counts["critical"] * 15
-    score -= severity_counts["high"] * 10
-    score -= severity_counts["medium"] * 5
-    score -= severity_counts["low"] * 1
+    score = 100 - sum(severity_counts[severity] * weight for severity, weight in SEVERITY_WEIGHTS.items())
     
     # Ensure score doesn't go below 0
-    return max(0, score) 
\ No newline at end of file
+    return max(0, score)
@@ -7,7 +7,11 @@ import re
 import random
 import string
 from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, urljoin
+from http.cookies import SimpleCookie, CookieError
+
+import requests
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -21,8 +25,15 @@ from selenium.common.exceptions import (
 )
 import undetected_chromedriver as uc
 import utils
+from browser_pool import acquire_driver, release_driver
 from bs4 import BeautifulSoup
 
+# Upper bound on threads used to evaluate the forms of a page
+CSRF_CHECK_WORKERS = 8
+
+# Hidden input names that look like anti-CSRF tokens
+_CSRF_NAME_RE = re.compile(r'csrf|token|nonce', re.IGNORECASE)
+
 def setup_browser() -> uc.Chrome:
     """
     Set up and configure the undetected Chrome browser.
@@ -52,52 +63,194 @@ def extract_form_details(html_content: str) -> List[Dict[str, Any]]:
         List of dictionaries with form details
     """
     forms = []
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, 'lxml')
     
     for form in soup.find_all('form'):
+        method = form.get('method') or 'get'
+        
+        # Extract input fields
+        inputs = [
+            {
+                'type': input_tag.get('type', 'text'),
+                'name': input_tag.get('name', ''),
+                'value': input_tag.get('value', '')
+            }
+            for input_tag in form.find_all('input')
+        ]
+        
+        # Check for potential CSRF tokens (the last matching field wins)
+        csrf_input = next(
+            (field for field in reversed(inputs)
+             if field['type'] == 'hidden' and field['name'] and _CSRF_NAME_RE.search(field['name'])),
+            None
+        )
+        
         form_details = {
             'action': form.get('action', ''),
-            'method': form.get('method', 'get').lower(),
+            'method': method.lower(),
             'id': form.get('id', ''),
             'name': form.get('name', ''),
-            'inputs': [],
-            'has_csrf_token': False
+            'inputs': inputs,
+            'has_csrf_token': csrf_input is not None
         }
-        
-        # Extract input fields
-        for input_tag in form.find_all('input'):
-            input_type = input_tag.get('type', 'text')
-            input_name = input_tag.get('name', '')
-            input_value = input_tag.get('value', '')
-            
-            form_details['inputs'].append({
-                'type': input_type,
-                'name': input_name,
-                'value': input_value
-            })
-            
-            # Check for potential CSRF tokens
-            if input_type == 'hidden' and input_name and (
-                'csrf' in input_name.lower() or 
-                'token' in input_name.lower() or
-                'nonce' in input_name.lower()
-            ):
-                form_details['has_csrf_token'] = True
-                form_details['csrf_field'] = input_name
-                form_details['csrf_value'] = input_value
+        if csrf_input:
+            form_details['csrf_field'] = csrf_input['name']
+            form_details['csrf_value'] = csrf_input['value']
         
         forms.append(form_details)
     
     return forms
 
-def check_for_csrf_protection(form: Dict[str, Any], cookies: List[Dict[str, str]], 
+def parse_set_cookie_headers(headers: List[str]) -> List[Dict[str, Any]]:
+    """
+    Convert raw Set-Cookie headers into the cookie format used by Selenium.
+    
+    Args:
+        headers: Set-Cookie header values
+        
+    Returns:
+        List of cookie dictionaries (name, value, secure, httpOnly, sameSite)
+    """
+    cookies = []
+    for header in headers:
+        parsed = SimpleCookie()
+        try:
+            parsed.load(header)
+        except CookieError:
+            continue
+        
+        for name, morsel in parsed.items():
+            cookie = {
+                'name': name,
+                'value': morsel.value,
+                'secure': bool(morsel['secure']),
+                'httpOnly': bool(morsel['httponly'])
+            }
+            if morsel['samesite']:
+                cookie['sameSite'] = morsel['samesite'].capitalize()
+            cookies.append(cookie)
+    
+    return cookies
+
+def collect_response_cookies(session: requests.Session, response: requests.Response) -> List[Dict[str, Any]]:
+    """
+    Collect the cookies a browser would hold for a page fetched over HTTP.
+    
+    Cookies set on redirect hops (e.g. a session cookie on the redirect to a
+    login form) count as well as those of the final response, and so do
+    cookies the session already held for the page's domain.
+    
+    Args:
+        session: HTTP session the page was fetched with
+        response: Final response (its history holds the redirect hops)
+        
+    Returns:
+        List of cookie dictionaries in the format of parse_set_cookie_headers
+    """
+    cookies = {}
+    for hop in (*response.history, response):
+        for cookie in parse_set_cookie_headers(hop.raw.headers.getlist("Set-Cookie")):
+            # A cookie set again later in the chain replaces the earlier one
+            cookies[cookie['name']] = cookie
+    
+    host = urlparse(response.url).hostname or ""
+    for jar_cookie in session.cookies:
+        domain = jar_cookie.domain.lstrip(".")
+        if jar_cookie.name in cookies or not (host == domain or host.endswith("." + domain)):
+            continue
+        # The jar keeps attributes it doesn't model (HttpOnly, SameSite) as-is
+        rest = {key.lower(): value for key, value in jar_cookie._rest.items()}
+        cookie = {
+            'name': jar_cookie.name,
+            'value': jar_cookie.value,
+            'secure': bool(jar_cookie.secure),
+            'httpOnly': 'httponly' in rest
+        }
+        if rest.get('samesite'):
+            cookie['sameSite'] = rest['samesite'].capitalize()
+        cookies[jar_cookie.name] = cookie
+    
+    return list(cookies.values())
+
+def fetch_page(session: requests.Session, url: str,
+               logger: logging.Logger) -> Optional[Tuple[str, List[Dict[str, Any]], str]]:
+    """
+    Fetch a page over plain HTTP instead of launching a browser.
+    
+    Args:
+        session: Pooled HTTP session
+        url: URL to fetch
+        logger: Logger instance
+        
+    Returns:
+        Tuple of (HTML, cookies, referrer policy), or None if the page could not be
+        fetched or its forms appear to be rendered by JavaScript
+    """
+    try:
+        response = session.get(url, timeout=10)
+        # Error pages (and bot challenges) don't show the real form
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"HTTP fetch of {url} failed, falling back to the browser: {str(e)}")
+        return None
+    
+    html_content = response.text
+    html_lower = html_content.lower()
+    if "<form" not in html_lower and "<script" in html_lower:
+        logger.info("No forms in the static HTML, using the browser to render the page")
+        return None
+    
+    cookies = collect_response_cookies(session, response)
+    referrer_policy = response.headers.get("Referrer-Policy", "")
+    return html_content, cookies, referrer_policy
+
+def wait_for_page_ready(driver: webdriver.Chrome, logger: logging.Logger,
+                        timeout: int = 10, form_timeout: int = 2) -> None:
+    """
+    Wait until the document has loaded and, briefly, for a form to appear.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        logger: Logger instance
+        timeout: Maximum seconds to wait for document.readyState to be complete
+        form_timeout: Maximum seconds to then wait for a <form> element
+    """
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+    except TimeoutException:
+        logger.warning(f"Page did not finish loading within {timeout} seconds, continuing")
+    
+    try:
+        WebDriverWait(driver, form_timeout).until(EC.presence_of_element_located((By.TAG_NAME, "form")))
+    except TimeoutException:
+        pass
+
+def summarize_cookies(cookies: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Count the page's cookies carrying each CSRF-relevant attribute.
+    
+    Args:
+        cookies: List of cookies from the browser or response
+        
+    Returns:
+        Dictionary with counts of secure, httpOnly and SameSite=Strict/Lax cookies
+    """
+    return {
+        'secure': sum(1 for cookie in cookies if cookie.get('secure')),
+        'httpOnly': sum(1 for cookie in cookies if cookie.get('httpOnly')),
+        'sameSite': sum(1 for cookie in cookies if cookie.get('sameSite') in ['Strict', 'Lax'])
+    }
+
+def check_for_csrf_protection(form: Dict[str, Any], cookie_summary: Dict[str, int], 
                              referer_policy: str) -> Dict[str, Any]:
     """
     Check a form for various CSRF protections.
     
     Args:
         form: Form details dictionary
-        cookies: List of cookies from the browser
+        cookie_summary: Cookie attribute counts from summarize_cookies
         referer_policy: Referrer policy from the response headers
         
     Returns:
@@ -112,19 +265,11 @@ def check_for_csrf_protection(form: Dict[str, Any], cookies: List[Dict[str, str]
         'score': 0  # Higher score means better protection
     }
     
-    # Check for secure cookies and SameSite attribute
-    for cookie in cookies:
-        if cookie.get('secure'):
-            protection['has_secure_cookie'] = True
-            protection['score'] += 1
-        
-        if cookie.get('httpOnly'):
-            protection['has_httponly_cookie'] = True
-            protection['score'] += 1
-        
-        if cookie.get('sameSite') in ['Strict', 'Lax']:
-            protection['has_samesite_cookie'] = True
-            protection['score'] += 2
+    # Check for secure cookies and SameSite attribute (scored per cookie)
+    protection['has_secure_cookie'] = cookie_summary['secure'] > 0
+    protection['has_httponly_cookie'] = cookie_summary['httpOnly'] > 0
+    protection['has_samesite_cookie'] = cookie_summary['sameSite'] > 0
+    protection['score'] += cookie_summary['secure'] + cookie_summary['httpOnly'] + 2 * cookie_summary['sameSite']
     
     # Check referrer policy
     if referer_policy in ['same-origin', 'strict-origin', 'strict-origin-when-cross-origin']:
@@ -145,15 +290,16 @@ def check_for_csrf_protection(form: Dict[str, Any], cookies: List[Dict[str, str]
     
     return protection
 
-def test_csrf_vulnerability(driver: webdriver.Chrome, url: str, 
-                           form: Dict[str, Any], logger: logging.Logger) -> Dict[str, Any]:
+def test_csrf_vulnerability(url: str, form: Dict[str, Any], cookie_summary: Dict[str, int],
+                           referrer_policy: str, logger: logging.Logger) -> Dict[str, Any]:
     """
     Test a form for CSRF vulnerability.
     
     Args:
-        driver: Selenium WebDriver instance
         url: URL of the page containing the form
         form: Form details dictionary
+        cookie_summary: Cookie attribute counts from summarize_cookies
+        referrer_policy: Referrer policy of the page
         logger: Logger instance
         
     Returns:
@@ -169,20 +315,8 @@ def test_csrf_vulnerability(driver: webdriver.Chrome, url: str,
         'details': ''
     }
     
-    # Get the cookies and referrer policy
-    cookies = driver.get_cookies()
-    referrer_policy = ''
-    
-    try:
-        # Get referrer policy if available
-        script = "return document.referrerPolicy || '';"
-        referrer_policy = driver.execute_script(script)
-    except Exception:
-        # Fallback if script execution fails
-        pass
-    
     # Analyze protection mechanisms
-    protection = check_for_csrf_protection(form, cookies, referrer_policy)
+    protection = check_for_csrf_protection(form, cookie_summary, referrer_policy)
     result['protection'] = protection
     
     # Determine vulnerability based on protection level
@@ -207,6 +341,24 @@ def test_csrf_vulnerability(driver: webdriver.Chrome, url: str,
     
     return result
 
+def check_form(url: str, form: Dict[str, Any], cookie_summary: Dict[str, int],
+               referrer_policy: str, logger: logging.Logger) -> Dict[str, Any]:
+    """
+    Test one form for CSRF vulnerability.
+    
+    Args:
+        url: URL of the page containing the form
+        form: Form details dictionary
+        cookie_summary: Cookie attribute counts from summarize_cookies
+        referrer_policy: Referrer policy of the page
+        logger: Logger instance
+        
+    Returns:
+        Test result dictionary
+    """
+    logger.info(f"Testing form (id={form.get('id', '')}, name={form.get('name', '')}) for CSRF vulnerabilities")
+    return test_csrf_vulnerability(url, form, cookie_summary, referrer_policy, logger)
+
 def run_csrf_mode(context: Dict[str, Any]) -> Dict[str, Any]:
     """
     Run CSRF testing mode.
@@ -239,17 +391,35 @@ def run_csrf_mode(context: Dict[str, Any]) -> Dict[str, Any]:
         "success": True
     }
     
+    csrf_settings = config.get("csrf_settings", {})
+    
+    driver = None
     try:
-        # Setup WebDriver
-        driver = utils.setup_driver(config, logger)
-        logger.info(f"Navigating to {url}")
-        driver.get(url)
-        
-        # Wait for the page to load
-        time.sleep(3)
+        # Plain HTTP is enough unless the forms are rendered by JavaScript
+        page = (fetch_page(utils.get_http_session(context), url, logger)
+                if csrf_settings.get("http_fetch", True) else None)
         
-        # Get page HTML
-        html_content = driver.page_source
+        if page:
+            html_content, cookies, referrer_policy = page
+        else:
+            # Setup WebDriver (shared pool in comprehensive mode)
+            driver = acquire_driver(context, lambda: utils.setup_driver(config, logger))
+            logger.info(f"Navigating to {url}")
+            driver.get(url)
+            
+            # Wait for the page to load, then briefly for a form (form-less pages proceed)
+            wait_for_page_ready(driver, logger)
+            
+            # Get page HTML, cookies and referrer policy (page-level, so read once)
+            html_content = driver.page_source
+            cookies = driver.get_cookies()
+            referrer_policy = ''
+            try:
+                # Get referrer policy if available
+                referrer_policy = driver.execute_script("return document.referrerPolicy || '';") or ''
+            except Exception:
+                # Fallback if script execution fails
+                pass
         
         # Extract form details
         forms = extract_form_details(html_content)
@@ -260,42 +430,51 @@ def run_csrf_mode(context: Dict[str, Any]) -> Dict[str, Any]:
             results["success"] = True
             return results
         
-        # Test each form for CSRF vulnerabilities
+        # Every form counts as tested; GET forms are skipped as they are less
+        # susceptible to CSRF
+        results["forms_tested"] = len(forms)
+        post_forms = []
         for form in forms:
-            results["forms_tested"] += 1
-            
-            # Skip GET forms as they are less susceptible to CSRF
             if form['method'] == 'get':
                 logger.info(f"Skipping GET form (id={form.get('id', '')}, name={form.get('name', '')})")
-                continue
-            
-            logger.info(f"Testing form (id={form.get('id', '')}, name={form.get('name', '')}) for CSRF vulnerabilities")
-            
-            # Test the form
-            test_result = test_csrf_vulnerability(driver, url, form, logger)
-            
-            # Record vulnerability if found
-            if test_result['vulnerable']:
-                results["vulnerabilities"].append({
-                    "form_id": test_result['form_id'],
-                    "form_name": test_result['form_name'],
-                    "type": "csrf",
-                    "severity": test_result['severity'],
-                    "details": test_result['details'],
-                    "protection": test_result['protection']
-                })
+            else:
+                post_forms.append(form)
+        
+        # Test each form for CSRF vulnerabilities. The checks don't touch the browser,
+        # so the forms are evaluated concurrently.
+        cookie_summary = summarize_cookies(cookies)
+        test_results = []
+        if post_forms:
+            with ThreadPoolExecutor(max_workers=min(CSRF_CHECK_WORKERS, len(post_forms))) as executor:
+                test_results = list(executor.map(
+                    lambda form: check_form(url, form, cookie_summary, referrer_policy, logger), post_forms
+                ))
+        
+        # Record vulnerabilities found
+        results["vulnerabilities"] = [
+            {
+                "form_id": test_result['form_id'],
+                "form_name": test_result['form_name'],
+                "type": "csrf",
+                "severity": test_result['severity'],
+                "details": test_result['details'],
+                "protection": test_result['protection']
+            }
+            for test_result in test_results
+            if test_result['vulnerable']
+        ]
         
         # Calculate result summary
         results["duration"] = time.time() - results["start_time"]
         results["vulnerable"] = len(results["vulnerabilities"]) > 0
         
-        # Close WebDriver
-        driver.quit()
-        
     except Exception as e:
         logger.error(f"Error during CSRF testing: {str(e)}")
         results["success"] = False
         results["error"] = str(e)
+    finally:
+        # Close WebDriver (or return it to the shared pool)
+        release_driver(context, driver, logger)
     
     # Log summary
     if results["vulnerable"]:
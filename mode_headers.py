@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
+import functools
 import logging
 import time
 import json
 import os
 import re
 import requests
-from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from requests.structures import CaseInsensitiveDict
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from urllib.parse import urlparse
 
 import undetected_chromedriver as uc
@@ -69,6 +73,22 @@ SECURITY_HEADERS = {
     }
 }
 
+# Precompiled/prebuilt lookups used by analyze_header
+_HSTS_MAX_AGE_RE = re.compile(r'max-age="?(\d+)', re.IGNORECASE)
+_FRAME_OPTIONS_ALLOWED = frozenset({'DENY', 'SAMEORIGIN'})
+# Referrer-Policy entries are matched as whole tokens. "no-referrer-when-downgrade"
+# is rated strong, as the substring match for "no-referrer" has always rated it
+_STRONG_REFERRER_POLICIES = frozenset({'no-referrer', 'no-referrer-when-downgrade', 'same-origin',
+                                       'strict-origin', 'strict-origin-when-cross-origin'})
+_MODERATE_REFERRER_POLICIES = frozenset({'origin', 'origin-when-cross-origin'})
+
+# Score weight of each checked header, derived once from its severity
+_SEVERITY_WEIGHT = {name: {'high': 3, 'medium': 2, 'low': 1}[info['severity']]
+                    for name, info in SECURITY_HEADERS.items()}
+# Header statuses that earn a header's weight in the score, and those counted as weak
+_PASSING_STATUSES = frozenset({'present', 'strong', 'moderate'})
+_FAILING_STATUSES = frozenset({'weak', 'invalid'})
+
 def setup_browser() -> uc.Chrome:
     """
     Set up and configure the undetected Chrome browser.
@@ -87,16 +107,30 @@ def setup_browser() -> uc.Chrome:
     # Use the centralized setup_driver function from utils
     return utils.setup_driver(config, logger)
 
-def analyze_header(header_name: str, header_value: str) -> Dict[str, Any]:
+@dataclass(frozen=True, slots=True)
+class HeaderResult:
+    """Analysis result for one security header."""
+    name: str
+    value: Optional[str]
+    description: str
+    status: str
+    severity: str
+    recommendation: str
+    info: str
+
+@functools.lru_cache(maxsize=4096)
+def analyze_header(header_name: str, header_value: str) -> HeaderResult:
     """
     Analyze a security header and evaluate its implementation.
     
+    Results are memoized (they are immutable) since the same headers recur across scans.
+    
     Args:
         header_name: Name of the header
         header_value: Value of the header
         
     Returns:
-        Dictionary with analysis results
+        HeaderResult with the analysis
     """
     header_info = SECURITY_HEADERS.get(header_name, {
         'description': header_name,
@@ -104,63 +138,62 @@ def analyze_header(header_name: str, header_value: str) -> Dict[str, Any]:
         'severity': 'low',
         'info': 'Custom security header'
     })
-    
-    result = {
-        'name': header_name,
-        'value': header_value,
-        'description': header_info['description'],
-        'status': 'present',
-        'severity': header_info['severity'],
-        'recommendation': header_info['recommendation'],
-        'info': header_info['info']
-    }
+    status = 'present'
+    info = header_info['info']
     
     # Perform header-specific analysis
     if header_name == 'Strict-Transport-Security':
-        if 'max-age=' in header_value:
-            try:
-                max_age = int(header_value.split('max-age=')[1].split(';')[0].strip())
-                if max_age < 31536000:  # Less than 1 year
-                    result['status'] = 'weak'
-                    result['info'] += '. The max-age is less than recommended (1 year)'
-            except:
-                result['status'] = 'invalid'
+        if 'max-age=' in header_value.lower():
+            match = _HSTS_MAX_AGE_RE.search(header_value)
+            if not match:
+                status = 'invalid'
+            elif int(match.group(1)) < 31536000:  # Less than 1 year
+                status = 'weak'
+                info += '. The max-age is less than recommended (1 year)'
         else:
-            result['status'] = 'weak'
+            status = 'weak'
             
     elif header_name == 'Content-Security-Policy':
         if "default-src 'none'" in header_value or "default-src 'self'" in header_value:
-            result['status'] = 'strong'
+            status = 'strong'
         elif "default-src" in header_value:
-            result['status'] = 'moderate'
+            status = 'moderate'
         else:
-            result['status'] = 'weak'
+            status = 'weak'
             
     elif header_name == 'X-Content-Type-Options':
         if header_value.lower() != 'nosniff':
-            result['status'] = 'weak'
+            status = 'weak'
             
     elif header_name == 'X-Frame-Options':
-        if header_value.upper() not in ['DENY', 'SAMEORIGIN']:
-            result['status'] = 'weak'
+        if header_value.strip().upper() not in _FRAME_OPTIONS_ALLOWED:
+            status = 'weak'
             
     elif header_name == 'X-XSS-Protection':
         if header_value != '1; mode=block':
-            result['status'] = 'weak'
+            status = 'weak'
             
     elif header_name == 'Referrer-Policy':
-        strong_policies = ['no-referrer', 'same-origin', 'strict-origin', 'strict-origin-when-cross-origin']
-        weak_policies = ['origin', 'origin-when-cross-origin', 'no-referrer-when-downgrade']
-        if any(policy in header_value for policy in strong_policies):
-            result['status'] = 'strong'
-        elif any(policy in header_value for policy in weak_policies):
-            result['status'] = 'moderate'
+        # The header may list several comma-separated policies (fallbacks)
+        policies = {policy.strip() for policy in header_value.lower().split(',')}
+        if policies & _STRONG_REFERRER_POLICIES:
+            status = 'strong'
+        elif policies & _MODERATE_REFERRER_POLICIES:
+            status = 'moderate'
         else:
-            result['status'] = 'weak'
+            status = 'weak'
     
-    return result
+    return HeaderResult(
+        name=header_name,
+        value=header_value,
+        description=header_info['description'],
+        status=status,
+        severity=header_info['severity'],
+        recommendation=header_info['recommendation'],
+        info=info
+    )
 
-def evaluate_security_headers(headers: Dict[str, str], logger: logging.Logger) -> List[Dict[str, Any]]:
+def evaluate_security_headers(headers: Mapping[str, str], logger: logging.Logger) -> List[HeaderResult]:
     """
     Evaluate security headers in a response.
     
@@ -169,34 +202,33 @@ def evaluate_security_headers(headers: Dict[str, str], logger: logging.Logger) -
         logger: Logger instance
         
     Returns:
-        List of dictionaries with header analysis results
+        List of header analysis results
     """
     results = []
-    headers_lower = {k.lower(): (k, v) for k, v in headers.items()}
+    # Response headers from requests are already case-insensitive
+    if not isinstance(headers, CaseInsensitiveDict):
+        headers = CaseInsensitiveDict(headers)
     
-    for header_name in SECURITY_HEADERS:
-        # Find the header (case-insensitive)
-        header_key_lower = header_name.lower()
-        if header_key_lower in headers_lower:
-            original_key, value = headers_lower[header_key_lower]
+    for header_name, header_info in SECURITY_HEADERS.items():
+        value = headers.get(header_name)
+        if value is not None:
             result = analyze_header(header_name, value)
             
-            if result['status'] == 'weak' or result['status'] == 'invalid':
+            if result.status in _FAILING_STATUSES:
                 logger.warning(f"Security header '{header_name}' has a weak implementation: {value}")
             
             results.append(result)
         else:
             # Header is missing
-            header_info = SECURITY_HEADERS[header_name]
-            results.append({
-                'name': header_name,
-                'value': None,
-                'description': header_info['description'],
-                'status': 'missing',
-                'severity': header_info['severity'],
-                'recommendation': header_info['recommendation'],
-                'info': header_info['info']
-            })
+            results.append(HeaderResult(
+                name=header_name,
+                value=None,
+                description=header_info['description'],
+                status='missing',
+                severity=header_info['severity'],
+                recommendation=header_info['recommendation'],
+                info=header_info['info']
+            ))
             
             if header_info['severity'] == 'high':
                 logger.warning(f"Important security header '{header_name}' is missing")
@@ -205,13 +237,50 @@ def evaluate_security_headers(headers: Dict[str, str], logger: logging.Logger) -
     
     return results
 
-def check_https_redirection(url: str, logger: logging.Logger) -> Dict[str, Any]:
+def _header_issue(header: HeaderResult) -> Optional[Dict[str, Any]]:
+    """
+    Build the finding reported for a missing or weak high-severity header.
+    
+    Args:
+        header: Header analysis result
+        
+    Returns:
+        Finding dictionary, or None if the header doesn't warrant one
+    """
+    if header.severity != 'high':
+        return None
+    
+    if header.status == 'missing':
+        return {
+            "type": "missing_header",
+            "header": header.name,
+            "severity": "high",
+            "details": f"Missing {header.description} header: {header.info}",
+            "recommendation": f"Add the header with value: {header.recommendation}",
+            "description": header.description,
+            "reference": f"https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/{header.name}"
+        }
+    if header.status in _FAILING_STATUSES:
+        return {
+            "type": "weak_header",
+            "header": header.name,
+            "severity": "medium",
+            "details": f"Weak implementation of {header.description} header: {header.value}",
+            "recommendation": f"Improve the header value to: {header.recommendation}",
+            "issue": f"Current value does not meet security best practices",
+            "value": header.value
+        }
+    return None
+
+def check_https_redirection(url: str, logger: logging.Logger,
+                            session: Optional[requests.Session] = None) -> Dict[str, Any]:
     """
     Check if HTTP requests are redirected to HTTPS.
     
     Args:
         url: URL to check
         logger: Logger instance
+        session: HTTP session to send the request with (plain requests if None)
         
     Returns:
         Dictionary with redirect check results
@@ -233,7 +302,11 @@ def check_https_redirection(url: str, logger: logging.Logger) -> Dict[str, Any]:
     try:
         # Try to access the site via HTTP
         http_url = f"http://{parsed_url.netloc}{parsed_url.path}"
-        response = requests.get(http_url, allow_redirects=True, timeout=10)
+        # Only the final URL matters, so avoid downloading the page body
+        client = session or requests
+        response = client.head(http_url, allow_redirects=True, timeout=10)
+        if response.status_code == 405:  # HEAD not allowed, fall back to GET
+            response = client.get(http_url, allow_redirects=True, timeout=10)
         
         # Check if we were redirected to HTTPS
         final_url = response.url
@@ -289,13 +362,23 @@ def run_headers_mode(context: Dict[str, Any]) -> Dict[str, Any]:
         "success": True
     }
     
+    # Reuse pooled connections (shared across tests in comprehensive mode)
+    session = utils.get_http_session(context)
+    # The HTTP-to-HTTPS redirect probe does not depend on the main request, so
+    # the two round-trips run concurrently
+    executor = ThreadPoolExecutor(max_workers=1)
+    
     try:
         logger.info(f"Testing security headers for {url}")
+        redirect_future = executor.submit(check_https_redirection, url, logger, session)
         
-        # Make a request to the target URL
+        # Make a request to the target URL. The body is read (not streamed) even
+        # though only the headers are needed, so the connection goes back to the
+        # session's pool for the next request instead of being dropped.
         try:
-            response = requests.get(url, timeout=10)
+            response = session.get(url, timeout=10)
             response.raise_for_status()  # Raise exception for 4XX/5XX status codes
+            headers = response.headers
         except requests.exceptions.RequestException as e:
             logger.error(f"Error connecting to {url}: {str(e)}")
             results["success"] = False
@@ -303,31 +386,36 @@ def run_headers_mode(context: Dict[str, Any]) -> Dict[str, Any]:
             return results
         
         # Extract and analyze headers
-        headers = response.headers
         header_results = evaluate_security_headers(headers, logger)
-        results["header_results"] = header_results
+        # Plain dicts from here on, for the report and JSON output
+        results["header_results"] = [asdict(header) for header in header_results]
         results["headers_tested"] = len(header_results)
         
-        # Count missing and weak headers
+        # Collect the HTTP to HTTPS redirection check
+        https_redirect = redirect_future.result()
+        results["https_redirect"] = https_redirect
+        
+        # Count missing and weak headers, accumulate the score weights and
+        # collect findings for high-severity headers in a single pass
+        total_weight = 0
+        earned_weight = 0
+        vulnerabilities = []
         for header in header_results:
-            if header['status'] == 'missing':
+            status = header.status
+            if status == 'missing':
                 results["missing_headers"] += 1
-            elif header['status'] in ['weak', 'invalid']:
+            elif status in _FAILING_STATUSES:
                 results["weak_headers"] += 1
-        
-        # Check HTTP to HTTPS redirection
-        https_redirect = check_https_redirection(url, logger)
-        results["https_redirect"] = https_redirect
-        
-        # Calculate overall security score (0-100)
-        total_weight = sum(3 if SECURITY_HEADERS[h['name']]['severity'] == 'high' else
-                           2 if SECURITY_HEADERS[h['name']]['severity'] == 'medium' else
-                           1 for h in header_results if h['name'] in SECURITY_HEADERS)
-        
-        earned_weight = sum(3 if SECURITY_HEADERS[h['name']]['severity'] == 'high' and h['status'] in ['present', 'strong', 'moderate'] else
-                           2 if SECURITY_HEADERS[h['name']]['severity'] == 'medium' and h['status'] in ['present', 'strong', 'moderate'] else
-                           1 if h['status'] in ['present', 'strong', 'moderate'] else
-                           0 for h in header_results if h['name'] in SECURITY_HEADERS)
+            
+            weight = _SEVERITY_WEIGHT.get(header.name)
+            if weight is not None:
+                total_weight += weight
+                if status in _PASSING_STATUSES:
+                    earned_weight += weight
+            
+            issue = _header_issue(header)
+            if issue:
+                vulnerabilities.append(issue)
         
         # Add bonus for HTTPS redirect
         if https_redirect['status'] == 'passed':
@@ -350,53 +438,27 @@ def run_headers_mode(context: Dict[str, Any]) -> Dict[str, Any]:
         # Calculate result summary
         results["duration"] = time.time() - results["start_time"]
         
-        # Add findings for missing critical headers
-        results["vulnerabilities"] = []
-        results["security_issues"] = []  # Initialize the security_issues list
-        
-        for header in header_results:
-            if header['status'] == 'missing' and header['severity'] == 'high':
-                issue = {
-                    "type": "missing_header",
-                    "header": header['name'],
-                    "severity": "high",
-                    "details": f"Missing {header['description']} header: {header['info']}",
-                    "recommendation": f"Add the header with value: {header['recommendation']}",
-                    "description": header['description'],
-                    "reference": f"https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/{header['name']}"
-                }
-                results["vulnerabilities"].append(issue)
-                results["security_issues"].append(issue)
-            elif header['status'] in ['weak', 'invalid'] and header['severity'] == 'high':
-                issue = {
-                    "type": "weak_header",
-                    "header": header['name'],
-                    "severity": "medium",
-                    "details": f"Weak implementation of {header['description']} header: {header['value']}",
-                    "recommendation": f"Improve the header value to: {header['recommendation']}",
-                    "issue": f"Current value does not meet security best practices",
-                    "value": header['value']
-                }
-                results["vulnerabilities"].append(issue)
-                results["security_issues"].append(issue)
-        
         # Add HTTPS redirect issue if applicable
         if https_redirect['status'] == 'failed':
-            issue = {
+            vulnerabilities.append({
                 "type": "http_not_redirected",
                 "severity": "high",
                 "details": "HTTP requests are not redirected to HTTPS",
                 "recommendation": "Configure the server to redirect all HTTP requests to HTTPS"
-            }
-            results["vulnerabilities"].append(issue)
-            results["security_issues"].append(issue)
+            })
         
-        results["vulnerable"] = len(results["vulnerabilities"]) > 0
+        results["vulnerabilities"] = vulnerabilities
+        results["security_issues"] = list(vulnerabilities)
+        results["vulnerable"] = len(vulnerabilities) > 0
         
     except Exception as e:
         logger.error(f"Error during security headers testing: {str(e)}")
         results["success"] = False
         results["error"] = str(e)
+    finally:
+        # Wait for the probe even on an early return, so it never uses the
+        # session after the caller (comprehensive mode) has closed it
+        executor.shutdown(wait=True)
     
     # Log summary
     if results.get("security_score"):
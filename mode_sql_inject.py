@@ -4,10 +4,14 @@ import time
 import random
 import re
 import json
-import os
-from typing import Dict, Any, List, Optional
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
 
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
@@ -18,6 +22,8 @@ from selenium.common.exceptions import (
 )
 import undetected_chromedriver as uc
 import utils
+from browser_pool import BrowserPool
+from bs4 import BeautifulSoup
 
 # SQL Injection Payloads organized by category
 SQL_INJECTION_PAYLOADS = {
@@ -64,24 +70,364 @@ SQL_INJECTION_PAYLOADS = {
         "' UNION%20SELECT%20'1'%2C'2'%2C'3'%2C'4'--"
     ]
 }
+# Categories are only read, so store them as tuples
+SQL_INJECTION_PAYLOADS = {category: tuple(payloads) for category, payloads in SQL_INJECTION_PAYLOADS.items()}
+# Every payload once, in category order (used when all categories are selected)
+ALL_SQL_INJECTION_PAYLOADS = tuple(dict.fromkeys(
+    payload for payloads in SQL_INJECTION_PAYLOADS.values() for payload in payloads
+))
+
+# Database error messages that suggest a payload reached the SQL layer
+SQL_ERROR_LITERALS = (
+    'sql syntax', 'unclosed quotation', 'unterminated string',
+    'sql error', 'syntax error', 'mysql error', 'postgresql error',
+    'database error', 'odbc driver', 'ora-', 'unexpected end',
+    'warning:', 'invalid query', 'sql state', 'microsoft sql',
+    'postgres error', 'mysqli', 'mysql_query'
+)
+# Error messages that need a regular expression
+SQL_ERROR_REGEXES = (
+    r'line \d+',
+)
+SQL_ERROR_TOKENS = SQL_ERROR_LITERALS + SQL_ERROR_REGEXES
+
+# All tokens in one case-insensitive alternation (literals escaped); group pN
+# identifies SQL_ERROR_TOKENS[N]
+SQL_ERROR_PATTERN = re.compile(
+    "|".join(
+        [f"(?P<p{i}>{re.escape(token)})" for i, token in enumerate(SQL_ERROR_LITERALS)] +
+        [f"(?P<p{i}>{token})" for i, token in enumerate(SQL_ERROR_REGEXES, len(SQL_ERROR_LITERALS))]
+    ),
+    re.IGNORECASE
+)
+
+def scan_for_sql_errors(page_source: str) -> Optional[str]:
+    """
+    Look for database error messages in a page.
+    
+    Args:
+        page_source: HTML of the page
+        
+    Returns:
+        The first matching entry of SQL_ERROR_TOKENS, or None
+    """
+    match = SQL_ERROR_PATTERN.search(page_source)
+    if match is None:
+        return None
+    return SQL_ERROR_TOKENS[int(match.lastgroup[1:])]
+
+# Maximum seconds to wait for a submitted form to respond
+SUBMISSION_WAIT = 2
+
+# Page sources shorter than this (an empty document) are not scanned
+MIN_PAGE_SOURCE_LENGTH = 50
+
+# Empties the visible text inputs so a form can be reused for the next payload
+CLEAR_FORM_SCRIPT = """
+document.querySelectorAll(
+    'textarea, input:not([type=hidden]):not([type=submit]):not([type=button])' +
+    ':not([type=checkbox]):not([type=radio]):not([type=file]):not([type=image])'
+).forEach(el => { el.value = ''; });
+"""
+
+# Minimal browser configuration used for SQL injection testing
+BROWSER_CONFIG = {
+    "name": "sql_inject_test_browser",
+}
+
+@dataclass(frozen=True)
+class FieldTest:
+    """Everything needed to submit payloads into one field, shared by all its payloads."""
+    url: str
+    field_name: str
+    field_config: Dict[str, Any]
+    other_fields: List[Tuple[str, Dict[str, Any], List[str]]]  # from utils.get_required_other_fields
+    submit_button: Dict[str, Any]
+    wait_time: int
+    baseline: Optional[bytes] = None  # fingerprint of the unsubmitted page
+
+def _page_fingerprint(page_source: str) -> bytes:
+    """Return a short digest identifying a page's HTML."""
+    return hashlib.blake2b(page_source.encode("utf-8", "replace"), digest_size=16).digest()
+
+def _capture_baseline(pool: BrowserPool, url: str, logger: logging.Logger) -> Optional[bytes]:
+    """
+    Fingerprint the form page as it looks before any payload is submitted.
+    
+    Args:
+        pool: Browser pool to borrow a browser from
+        url: URL of the page with the form
+        logger: Logger instance
+        
+    Returns:
+        Page fingerprint, or None if the page could not be loaded
+    """
+    driver = pool.acquire()
+    try:
+        driver.get(url)
+        return _page_fingerprint(driver.page_source)
+    except Exception as e:
+        logger.warning(f"Could not capture baseline page: {e}")
+        return None
+    finally:
+        pool.release(driver)
+
+def _test_single_payload(driver: uc.Chrome, test: FieldTest, payload: str, logger: logging.Logger,
+                         reload: bool = True) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Submit the form once with a payload in one field and scan the response for SQL errors.
+    
+    Args:
+        driver: WebDriver instance
+        test: Field under test
+        payload: SQL injection payload
+        logger: Logger instance
+        reload: Load the page first; if False the form left by the previous
+                payload is cleared and reused
+        
+    Returns:
+        Tuple of (details of the suspicious response or None, whether the form
+        is still on the page and can be reused for the next payload)
+    """
+    url = test.url
+    field_name = test.field_name
+    wait_time = test.wait_time
+    selector = test.field_config.get("selector")
+    by_type = utils.get_selector_by(test.field_config)
+    
+    reusable = False
+    try:
+        # Load the page, or reset the form still shown after an in-place submission
+        if reload:
+            driver.get(url)
+        else:
+            driver.execute_script(CLEAR_FORM_SCRIPT)
+        
+        # Find and fill the field (waiting for it replaces a fixed page-load sleep)
+        wait = WebDriverWait(driver, wait_time)
+        element = wait.until(EC.presence_of_element_located((by_type, selector)))
+        element.clear()
+        element.send_keys(payload)
+        
+        # Fill other required fields with benign data in one script call, then
+        # fall back to WebDriver for any the script could not handle
+        filled = utils.fill_fields_via_script(
+            driver, [(selectors, "test data") for _, _, selectors in test.other_fields]
+        )
+        for (other_name, other_field, _), was_filled in zip(test.other_fields, filled):
+            if was_filled:
+                continue
+            try:
+                other_element = WebDriverWait(driver, wait_time).until(
+                    EC.presence_of_element_located((utils.get_selector_by(other_field), other_field["selector"]))
+                )
+                other_element.clear()
+                other_element.send_keys("test data")
+            except (TimeoutException, NoSuchElementException):
+                logger.warning(f"Could not find element for field '{other_name}'")
+        
+        # Submit the form
+        submit_selector = test.submit_button.get("selector")
+        by_submit_type = utils.get_selector_by(test.submit_button)
+        
+        navigated = False
+        prior_url = None
+        if submit_selector:
+            try:
+                submit_btn = WebDriverWait(driver, wait_time).until(
+                    EC.element_to_be_clickable((by_submit_type, submit_selector))
+                )
+            except (TimeoutException, NoSuchElementException):
+                logger.warning("Could not find submit button")
+            else:
+                prior_url = driver.current_url
+                submit_btn.click()
+                # Wait for the form to navigate or reload; responses rendered in
+                # place never trigger either, so the wait is capped
+                try:
+                    WebDriverWait(driver, SUBMISSION_WAIT).until(
+                        EC.any_of(EC.url_changes(prior_url), EC.staleness_of(submit_btn))
+                    )
+                    navigated = True
+                except TimeoutException:
+                    pass
+        # No navigation within the capped wait proves nothing about a slow
+        # response, so only reuse a page that is verifiably unchanged: same URL
+        # and the same field element
+        reusable = (not navigated and prior_url is not None and driver.current_url == prior_url
+                    and not EC.staleness_of(element)(driver))
+        
+        # Nothing to scan if the page is empty or still identical to the unsubmitted form
+        page_source = driver.page_source
+        if len(page_source) < MIN_PAGE_SOURCE_LENGTH or _page_fingerprint(page_source) == test.baseline:
+            return None, reusable
+        
+        # Check for signs of successful SQL injection
+        pattern = scan_for_sql_errors(page_source)
+        if pattern:
+            alert_message = f"POTENTIAL SQL INJECTION VULNERABILITY DETECTED! Field: {field_name}, Payload: {payload}"
+            logger.critical(alert_message)
+            # Reload before the next payload so this error message can't be
+            # attributed to it
+            return {
+                'field': field_name,
+                'payload': payload,
+                'pattern_matched': pattern,
+                'url': url
+            }, False
+        
+    except (TimeoutException, NoSuchElementException) as e:
+        logger.warning(f"Could not find element for field '{field_name}': {e}")
+    except (ElementNotInteractableException, StaleElementReferenceException) as e:
+        logger.warning(f"Could not interact with element for field '{field_name}': {e}")
+    except Exception as e:
+        logger.error(f"Error testing payload on field '{field_name}': {e}")
+        reusable = False
+    
+    return None, reusable
+
+@dataclass(frozen=True)
+class HttpFormTarget:
+    """A form that can be submitted with plain HTTP POSTs instead of a browser."""
+    action_url: str
+    payload_field: str  # name attribute of the field receiving payloads
+    data: Dict[str, str]  # values of the other form controls
+
+def _default_form_data(form) -> Dict[str, str]:
+    """
+    Collect the values a browser would submit for an untouched form.
+    
+    Args:
+        form: BeautifulSoup <form> element
+        
+    Returns:
+        Dict of control name to value
+    """
+    data = {}
+    for control in form.find_all(['input', 'textarea', 'select']):
+        name = control.get('name')
+        control_type = control.get('type', '').lower()
+        if not name or control_type in ('submit', 'button', 'image', 'reset', 'file'):
+            continue
+        if control_type in ('checkbox', 'radio') and not control.has_attr('checked'):
+            continue
+        
+        if control.name == 'textarea':
+            data[name] = control.get_text()
+        elif control.name == 'select':
+            option = control.find('option', selected=True) or control.find('option')
+            data[name] = option.get('value', option.get_text()) if option else ''
+        else:
+            data[name] = control.get('value', 'on' if control_type in ('checkbox', 'radio') else '')
+    return data
+
+def _discover_http_form(session: requests.Session, test: FieldTest,
+                        logger: logging.Logger) -> Optional[HttpFormTarget]:
+    """
+    Find the form holding the tested field in the static HTML of the page.
+    
+    Only plain POST forms qualify; forms submitted by JavaScript (onsubmit
+    handlers) or fields that can't be located by CSS or name keep using the browser.
+    
+    Args:
+        session: Pooled HTTP session
+        test: Field under test
+        logger: Logger instance
+        
+    Returns:
+        HttpFormTarget, or None if the form can't be submitted over plain HTTP
+    """
+    try:
+        response = session.get(test.url, timeout=10)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.info(f"HTTP fetch of {test.url} failed, using the browser: {e}")
+        return None
+    
+    soup = BeautifulSoup(response.text, 'lxml')
+    
+    def find(selectors: List[str]):
+        for selector in selectors:
+            try:
+                element = soup.select_one(selector)
+            except Exception:
+                element = None
+            if element is not None:
+                return element
+        return None
+    
+    element = find(utils.get_field_css_selectors(test.field_config))
+    form = element.find_parent('form') if element is not None else None
+    if (form is None or not element.get('name') or form.get('onsubmit')
+            or (form.get('method') or 'get').lower() != 'post'):
+        return None
+    
+    # Start from the form's own values (including hidden tokens), then fill the
+    # other required fields with the same benign data as the browser path
+    data = _default_form_data(form)
+    for _, _, selectors in test.other_fields:
+        other_element = find(selectors)
+        if other_element is not None and other_element.get('name'):
+            data[other_element['name']] = "test data"
+    
+    return HttpFormTarget(urljoin(response.url, form.get('action') or ''), element['name'], data)
 
-def setup_browser() -> uc.Chrome:
+def _probe_via_http(session: requests.Session, target: HttpFormTarget, test: FieldTest, payload: str,
+                    logger: logging.Logger) -> Optional[Dict[str, Any]]:
     """
-    Set up and configure the undetected Chrome browser.
+    Submit one payload with a direct POST and scan the response for SQL errors.
     
     Returns:
-        Configured Chrome WebDriver instance
+        Details of the suspicious response, or None if nothing was detected
     """
-    # Create a simple logger for this function
-    logger = logging.getLogger(__name__)
+    logger.info(f"Testing payload on field '{test.field_name}': {payload}")
+    data = dict(target.data)
+    data[target.payload_field] = payload
+    try:
+        response = session.post(target.action_url, data=data, timeout=10)
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Error posting payload to field '{test.field_name}': {e}")
+        return None
     
-    # Create minimal config
-    config = {
-        "name": "sql_inject_test_browser",
+    pattern = scan_for_sql_errors(response.text)
+    if not pattern:
+        return None
+    logger.critical(f"POTENTIAL SQL INJECTION VULNERABILITY DETECTED! Field: {test.field_name}, Payload: {payload}")
+    return {
+        'field': test.field_name,
+        'payload': payload,
+        'pattern_matched': pattern,
+        'url': test.url
     }
+
+def _run_payloads(pool: BrowserPool, test: FieldTest, payloads: List[str],
+                  logger: logging.Logger) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Test a batch of payloads on one browser checked out of the pool.
+    
+    The page is only reloaded when a submission navigated away (or failed);
+    forms answered in place are cleared and reused for the next payload.
     
-    # Use the centralized setup_driver function from utils
-    return utils.setup_driver(config, logger)
+    Returns:
+        Tuple of (number of payloads tested, suspicious responses)
+    """
+    tested = 0
+    results = []
+    reload = True
+    driver = pool.acquire()
+    try:
+        for payload in payloads:
+            tested += 1
+            logger.info(f"Testing payload on field '{test.field_name}': {payload}")
+            result, reusable = _test_single_payload(driver, test, payload, logger, reload=reload)
+            if result:
+                results.append(result)
+            reload = not reusable
+            # Brief pause between tests on the same browser
+            time.sleep(1)
+    finally:
+        pool.release(driver)
+    return tested, results
 
 def run_sql_injection_mode(context: Dict[str, Any]) -> None:
     """
@@ -100,16 +446,28 @@ def run_sql_injection_mode(context: Dict[str, Any]) -> None:
         return
     
     logger.info(f"Starting SQL injection testing on URL: {url}")
-    logger.info(f"Using configuration: {json.dumps(config, indent=2)}")
+    # Serializing the whole config is only worth it when the message is emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Using configuration: %s", json.dumps(dict(config), indent=2))
     
     # Get SQL injection settings
     sql_settings = config.get("sql_injection_settings", {})
     test_all_fields = sql_settings.get("test_all_fields", True)
     max_attempts_per_field = sql_settings.get("max_attempts_per_field", 0)  # 0 means test all payloads
     payload_categories = sql_settings.get("payload_categories", list(SQL_INJECTION_PAYLOADS.keys()))
+    parallel_browsers = max(1, sql_settings.get("parallel_browsers", 1))
+    # Opt-in: post payloads over HTTP for plain forms, skipping the browser
+    http_fast_path = sql_settings.get("http_fast_path", False)
+    # A session of its own, so cookies set by the probes don't leak into the
+    # session other modes share (and theirs don't affect the probes)
+    session = (utils.create_http_session(retries=config.get("http_retries", 0), user_agent=config.get("user_agent"))
+               if http_fast_path else None)
     
-    # Set up the browser
-    driver = setup_browser()
+    # Payloads run on pooled browsers (the shared pool in comprehensive mode)
+    pool = context.get("driver_pool")
+    owns_pool = pool is None
+    if owns_pool:
+        pool = BrowserPool(BROWSER_CONFIG, logger, size=parallel_browsers, warm_url=url)
     
     # Track results
     total_tests = 0
@@ -120,124 +478,72 @@ def run_sql_injection_mode(context: Dict[str, Any]) -> None:
         fields = config.get("fields", {})
         text_fields = {name: field for name, field in fields.items() 
                       if name != "submit_button" and field.get("type") != "checkbox"}
+        submit_button = fields.get("submit_button", {})
+        wait_time = utils.get_element_wait_time(context)
         
-        for field_name, field_config in text_fields.items():
-            selector = field_config.get("selector")
-            selector_type = utils.get_selector_type(field_config)
-            wait_time = utils.get_element_wait_time(context)
-            
-            if not selector:
-                logger.warning(f"No selector defined for field '{field_name}', skipping")
-                continue
-            
-            logger.info(f"Testing field '{field_name}' with selector: {selector}")
-            
-            # Combine payloads from selected categories
-            payloads = []
-            for category in payload_categories:
-                if category in SQL_INJECTION_PAYLOADS:
-                    payloads.extend(SQL_INJECTION_PAYLOADS[category])
-            
-            # Limit number of payloads if max_attempts is set
-            if max_attempts_per_field > 0 and max_attempts_per_field < len(payloads):
-                payloads = random.sample(payloads, max_attempts_per_field)
-            
-            # Test each payload
-            for payload in payloads:
-                total_tests += 1
-                logger.info(f"Testing payload #{total_tests}: {payload}")
+        # Combine payloads from selected categories (the same for every field),
+        # testing a payload listed in several categories only once
+        if set(payload_categories) >= SQL_INJECTION_PAYLOADS.keys():
+            all_payloads = ALL_SQL_INJECTION_PAYLOADS
+        else:
+            all_payloads = tuple(dict.fromkeys(payload for category in payload_categories
+                                               if category in SQL_INJECTION_PAYLOADS
+                                               for payload in SQL_INJECTION_PAYLOADS[category]))
+        
+        # Responses identical to the untouched form page need no scanning
+        baseline = None if http_fast_path else _capture_baseline(pool, url, logger)
+        
+        with ThreadPoolExecutor(max_workers=parallel_browsers) as executor:
+            for field_name, field_config in text_fields.items():
+                selector = field_config.get("selector")
                 
-                # Load the page
-                driver.get(url)
-                time.sleep(2)  # Wait for page to load
+                if not selector:
+                    logger.warning(f"No selector defined for field '{field_name}', skipping")
+                    continue
                 
-                # Find and fill the field
-                by_type = By.CSS_SELECTOR if selector_type == "css" else By.XPATH
+                logger.info(f"Testing field '{field_name}' with selector: {selector}")
                 
-                try:
-                    wait = WebDriverWait(driver, wait_time)
-                    element = wait.until(EC.presence_of_element_located((by_type, selector)))
-                    element.clear()
-                    element.send_keys(payload)
-                    
-                    # Fill other required fields with benign data
-                    for other_name, other_field in fields.items():
-                        if other_name != field_name and other_name != "submit_button" and other_field.get("required", False):
-                            other_selector = other_field.get("selector")
-                            other_type = utils.get_selector_type(other_field)
-                            
-                            if not other_selector:
-                                continue
-                                
-                            by_other_type = By.CSS_SELECTOR if other_type == "css" else By.XPATH
-                            try:
-                                other_element = WebDriverWait(driver, wait_time).until(
-                                    EC.presence_of_element_located((by_other_type, other_selector))
-                                )
-                                other_element.clear()
-                                other_element.send_keys("test data")
-                            except (TimeoutException, NoSuchElementException):
-                                logger.warning(f"Could not find element for field '{other_name}'")
-                    
-                    # Submit the form
-                    submit_button = fields.get("submit_button", {})
-                    submit_selector = submit_button.get("selector")
-                    submit_type = utils.get_selector_type(submit_button)
-                    
-                    if submit_selector:
-                        by_submit_type = By.CSS_SELECTOR if submit_type == "css" else By.XPATH
-                        try:
-                            submit_btn = WebDriverWait(driver, wait_time).until(
-                                EC.element_to_be_clickable((by_submit_type, submit_selector))
-                            )
-                            submit_btn.click()
-                            time.sleep(2)  # Wait for form submission
-                        except (TimeoutException, NoSuchElementException):
-                            logger.warning("Could not find submit button")
-                    
-                    # Check for signs of successful SQL injection
-                    page_source = driver.page_source.lower()
-                    error_patterns = [
-                        'sql syntax', 'unclosed quotation', 'unterminated string',
-                        'sql error', 'syntax error', 'mysql error', 'postgresql error',
-                        'database error', 'odbc driver', 'ora-', 'line \d+', 'syntax error',
-                        'unexpected end', 'warning:', 'invalid query', 'sql state',
-                        'microsoft sql', 'postgres error', 'mysqli', 'mysql_query'
-                    ]
-                    
-                    for pattern in error_patterns:
-                        if re.search(pattern, page_source):
-                            alert_message = f"POTENTIAL SQL INJECTION VULNERABILITY DETECTED! Field: {field_name}, Payload: {payload}"
-                            logger.critical(alert_message)
-                            suspicious_responses.append({
-                                'field': field_name,
-                                'payload': payload,
-                                'pattern_matched': pattern,
-                                'url': url
-                            })
-                            break
-                    
-                except (TimeoutException, NoSuchElementException) as e:
-                    logger.warning(f"Could not find element for field '{field_name}': {e}")
-                except (ElementNotInteractableException, StaleElementReferenceException) as e:
-                    logger.warning(f"Could not interact with element for field '{field_name}': {e}")
-                except Exception as e:
-                    logger.error(f"Error testing payload on field '{field_name}': {e}")
+                # Limit number of payloads if max_attempts is set (a new sample per field)
+                payloads = all_payloads
+                if max_attempts_per_field > 0 and max_attempts_per_field < len(payloads):
+                    payloads = random.sample(payloads, max_attempts_per_field)
                 
-                # Brief pause between tests
-                time.sleep(1)
+                test = FieldTest(url, field_name, field_config, utils.get_required_other_fields(fields, field_name),
+                                 submit_button, wait_time, baseline)
+                target = _discover_http_form(session, test, logger) if http_fast_path else None
                 
-            # Stop testing more fields if test_all_fields is False and we found something
-            if not test_all_fields and suspicious_responses:
-                logger.info("Vulnerability found and test_all_fields is False. Stopping further tests.")
-                break
+                # Test the field's payloads concurrently (one browser per worker on the browser path)
+                if target:
+                    logger.info(f"Posting payloads for '{field_name}' directly to {target.action_url}")
+                    field_results = list(executor.map(
+                        lambda payload: _probe_via_http(session, target, test, payload, logger), payloads
+                    ))
+                    total_tests += len(field_results)
+                    suspicious_responses.extend(result for result in field_results if result)
+                else:
+                    # Deal the payloads out so each worker keeps one browser for its batch
+                    workers = min(parallel_browsers, len(payloads))
+                    batches = executor.map(
+                        lambda batch: _run_payloads(pool, test, batch, logger),
+                        [payloads[i::workers] for i in range(workers)]
+                    )
+                    for tested, results in batches:
+                        total_tests += tested
+                        suspicious_responses.extend(results)
+                    
+                # Stop testing more fields if test_all_fields is False and we found something
+                if not test_all_fields and suspicious_responses:
+                    logger.info("Vulnerability found and test_all_fields is False. Stopping further tests.")
+                    break
     
     except Exception as e:
         logger.error(f"Error during SQL injection testing: {e}")
     finally:
-        # Close the browser
-        driver.quit()
-        logger.info("Browser closed")
+        # Close the browsers (a shared pool is shut down by its owner)
+        if owns_pool:
+            pool.shutdown()
+        if session is not None:
+            session.close()
     
     # Generate report
     logger.info(f"SQL Injection testing completed: {total_tests} tests executed")
@@ -251,4 +557,4 @@ def run_sql_injection_mode(context: Dict[str, Any]) -> None:
             logger.critical(f"  Pattern Matched: {vuln['pattern_matched']}")
             logger.critical(f"  URL: {vuln['url']}")
     else:
-        logger.info("No obvious SQL injection vulnerabilities detected") 
\ No newline at end of file
+        logger.info("No obvious SQL injection vulnerabilities detected")
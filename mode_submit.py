@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
+import asyncio
 import logging
 import time
 import random
 import os
-import json
-import re
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Tuple
+import atexit
+from types import MappingProxyType
+from typing import Dict, Any, Callable, List, Mapping, Optional, Sequence, Tuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -18,155 +18,310 @@ from selenium.common.exceptions import (
 )
 import utils
 import undetected_chromedriver as uc
+from browser_pool import BrowserPool
 
-# Load random data
-RANDOM_DATA = utils.load_random_data()
+__all__ = [
+    "prepare_form",
+    "compile_text_filler",
+    "submit_once",
+    "submission_loop",
+    "run_submit_mode",
+]
 
-def setup_browser() -> uc.Chrome:
+# Private generator for submission timing and field values so they don't share
+# state with the global random instance; seeded from the OS entropy pool
+_RNG = random.Random(os.urandom(16))
+
+def prepare_form(config: Dict[str, Any]) -> Mapping[str, Any]:
     """
-    Set up and configure the undetected Chrome browser.
+    Precompute the per-form data every submission needs, once per run.
+    
+    Text fields configured with "use_send_keys": true (e.g. inputs with strict
+    keypress listeners) are left out of the script-filled batch; the per-field
+    fallback types into them.
+    
+    Args:
+        config: Form configuration
     
     Returns:
-        Configured Chrome WebDriver instance
+        Read-only mapping with "fields" ((name, info) tuples, submit button
+        excluded), "fill_text_fields" (see compile_text_filler),
+        "first_field_locator" (CSS locator matching the first field with an
+        id, name or selector, or None), "required_count" and the timing
+        settings ("min_interval", "max_interval", "submission_wait",
+        "element_wait_time")
     """
-    # Create a simple logger for this function
-    logger = logging.getLogger(__name__)
+    fields = tuple((name, info) for name, info in config.get("fields", {}).items()
+                   if name != "submit_button")
+    text_fields = tuple(
+        (name, info) for name, info in fields
+        if info.get("type", "text") not in utils.NON_TEXT_FIELD_TYPES
+        and not info.get("use_send_keys", False)
+    )
+    # Any of the first field's selectors (CSS selector, name or id) signals the form rendered
+    first_field_selectors = next(
+        filter(None, (utils.get_field_css_selectors(info) for _, info in fields)), None
+    )
+    timing_config = config.get("timing", {})
+    return MappingProxyType({
+        "min_interval": timing_config.get("min_interval", 300),  # 5 minutes default
+        "max_interval": timing_config.get("max_interval", 2700),  # 45 minutes default
+        "submission_wait": timing_config.get("submission_wait", 5),
+        "fields": fields,
+        "fill_text_fields": compile_text_filler(text_fields, _RNG),
+        "element_wait_time": utils.get_element_wait_time({"config": config}),
+        "first_field_locator": ((By.CSS_SELECTOR, ", ".join(first_field_selectors))
+                                if first_field_selectors else None),
+        "required_count": sum(1 for _, info in fields if info.get("required", True)),
+    })
+
+def compile_text_filler(
+    text_fields: Sequence[Tuple[str, Dict[str, Any]]],
+    rng: Optional[random.Random] = None
+) -> Callable[[uc.Chrome, logging.Logger], List[str]]:
+    """
+    Build a function that fills the given text fields in a single round-trip.
     
-    # Create minimal config
-    config = {
-        "name": "submit_test_browser",
-    }
+    Each field's CSS selectors and value generator are resolved here, once,
+    so a fill only generates the values and runs the script.
+    
+    Args:
+        text_fields: (name, field configuration) pairs of script-fillable fields
+        rng: Random number generator the values are drawn from
     
-    # Use the centralized setup_driver function from utils
-    return utils.setup_driver(config, logger)
+    Returns:
+        Function taking (driver, logger) and returning the names of the fields filled
+    """
+    plan = tuple(
+        (field_name, utils.get_field_css_selectors(field_info),
+         utils.get_field_value_generator(field_name, field_info, rng))
+        for field_name, field_info in text_fields
+    )
+    
+    def fill_text_fields(driver: uc.Chrome, logger: logging.Logger) -> List[str]:
+        values = [generate() for _, _, generate in plan]
+        results = utils.fill_fields_via_script(driver, [
+            (selectors, value) for (_, selectors, _), value in zip(plan, values)
+        ])
+        
+        filled = []
+        for (field_name, _, _), value, success in zip(plan, values, results):
+            if success:
+                filled.append(field_name)
+                logger.debug("Filled field '%s' with value: %s", field_name, value)
+        return filled
+    
+    return fill_text_fields
 
-def fill_form_field(
-    driver: uc.Chrome,
-    field_name: str,
-    field_config: Dict[str, Any],
-    context: Dict[str, Any],
+def submit_once(
+    pool: BrowserPool,
+    config: Dict[str, Any],
+    form: Mapping[str, Any],
+    url: str,
+    submission_wait: int,
     logger: logging.Logger
 ) -> bool:
     """
-    Fill a form field with random or generated data.
+    Perform a single form submission with a pooled browser.
     
     Args:
-        driver: Selenium WebDriver instance
-        field_name: Name of the field to fill
-        field_config: Configuration for the field
-        context: Application context
+        pool: Browser pool to check a WebDriver out of
+        config: Form configuration
+        form: Precomputed form data from prepare_form
+        url: Target URL
+        submission_wait: Seconds to wait for a response after clicking submit
         logger: Logger instance
     
     Returns:
-        True if field was filled successfully, False otherwise
+        True if the form was submitted, False otherwise
     """
-    if field_name == "submit_button":
-        return True
-        
-    selector = field_config.get("selector")
-    selector_type = utils.get_selector_type(field_config)
-    wait_time = utils.get_element_wait_time(context)
-    
-    if not selector:
-        logger.warning(f"No selector defined for field '{field_name}', skipping")
-        return False
-    
+    driver = None
+    recycle_driver = False
     try:
-        # Wait for the element to be present
-        by_type = By.CSS_SELECTOR if selector_type == "css" else By.XPATH
-        wait = WebDriverWait(driver, wait_time)
-        element = wait.until(EC.presence_of_element_located((by_type, selector)))
+        # Check out the pooled WebDriver (created on first use with utils.setup_driver)
+        logger.info("Acquiring WebDriver for submission")
+        driver = pool.acquire()
         
-        # Generate a value for the field
-        config = context["config"]
-        value = ""
+        # Get form fields from the configuration
+        fields = form["fields"]
+        if not fields:
+            logger.error("No form fields defined in the configuration")
+            return False
         
-        if field_name.lower() in ["first_name", "firstname", "first", "fname"]:
-            value = utils.generate_name("first")
-        elif field_name.lower() in ["last_name", "lastname", "last", "lname"]:
-            value = utils.generate_name("last")
-        elif field_name.lower() in ["email", "email_address", "emailaddress"]:
-            value = utils.generate_email()
-        elif field_name.lower() in ["phone", "phone_number", "phonenumber"]:
-            # Get area code type from field config
-            area_code_type = None
-            if "area_code_type" in field_config:
-                area_code_type = field_config["area_code_type"]
-            value = utils.generate_phone(area_code_type)
-        else:
-            # For other fields, try to find a matching random value
-            if "values" in field_config:
-                value = random.choice(field_config["values"])
+        # Navigate to the form URL
+        logger.info("Navigating to %s", url)
+        utils.navigate(driver, url, config, logger)
+        
+        # Wait for the form to render (its first configured field) instead of a fixed delay
+        first_field_locator = form["first_field_locator"]
+        if first_field_locator:
+            element_wait_time = form["element_wait_time"]
+            try:
+                WebDriverWait(driver, element_wait_time, poll_frequency=utils.POLL_FREQUENCY,
+                              ignored_exceptions=utils.IGNORED_WAIT_EXCEPTIONS).until(
+                    EC.presence_of_element_located(first_field_locator)
+                )
+            except TimeoutException:
+                # Individual fields are still looked up (and reported) below
+                logger.warning("Form did not appear within %s seconds", element_wait_time)
+        
+        # Log fields that will be filled
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Configuration defines %d fields to fill: %s",
+                        len(fields), ", ".join(name for name, _ in fields))
+        
+        # Fill text fields in one script call; the rest (and any misses) go field by field
+        filled_by_script = form["fill_text_fields"](driver, logger)
+        
+        # Fill form fields with random data (only those explicitly defined in config)
+        field_fill_count = 0
+        for field_name, field_info in fields:
+            if field_name in filled_by_script:
+                success = True
             else:
-                # Default to a short random string
-                value = f"test_{random.randint(1000, 9999)}"
+                logger.info("Filling field: %s", field_name)
+                success = utils.fill_field_with_random_data(driver, field_name, field_info, logger, _RNG)
+            if success:
+                field_fill_count += 1
+                logger.debug("Successfully filled field: %s", field_name)
+            else:
+                # Don't treat this as a critical error if the field is marked as not required
+                if field_info.get("required", True):
+                    logger.warning("Failed to fill required field: %s", field_name)
+                else:
+                    logger.info("Skipped optional field: %s", field_name)
+        
+        # Check if enough fields were filled
+        required_fields = form["required_count"]
+        
+        if field_fill_count == 0:
+            logger.error("Failed to fill any fields, possible configuration issue")
+            return False
+        elif field_fill_count < required_fields:
+            logger.warning("Filled only %d of %d required fields", field_fill_count, required_fields)
+        else:
+            logger.info("Filled all %d required fields", required_fields)
         
-        # Clear the field and fill it
-        element.clear()
-        element.send_keys(value)
+        # Find and click the submit button, finding it again if the page
+        # re-rendered it before the click landed
+        def locate_submit_button() -> Any:
+            button = utils.find_submit_button(driver, config)
+            if not button:
+                raise NoSuchElementException("Submit button not found")
+            return button
         
-        logger.info(f"Filled {field_name}: {value}")
+        def click(button: Any) -> Any:
+            logger.info("Found submit button, clicking...")
+            button.click()
+            return button
+        
+        old_url = driver.current_url
+        try:
+            submit_button = utils.with_stale_retry(locate_submit_button, click)
+        except NoSuchElementException:
+            logger.error("Submit button not found")
+            return False
+        
+        # Wait for submission to complete (URL change, page reload or result message)
+        result_selectors = config.get("post_submit_success_selector") or utils.SUBMISSION_RESULT_SELECTORS
+        if not utils.wait_for_submission(driver, old_url, submission_wait, result_selectors,
+                                         submit_element=submit_button):
+            logger.info("No response detected within %s seconds, continuing", submission_wait)
+        
+        # Success!
+        logger.info("Form submitted successfully")
         return True
         
-    except (TimeoutException, NoSuchElementException) as e:
-        logger.warning(f"Could not find element for field '{field_name}': {e}")
-        return False
-    except (ElementNotInteractableException, StaleElementReferenceException) as e:
-        logger.warning(f"Could not interact with element for field '{field_name}': {e}")
+    except (TimeoutException, NoSuchElementException, 
+            ElementNotInteractableException, StaleElementReferenceException) as e:
+        # Page-level problems; the browser itself is still usable
+        logger.error("Selenium error during submission: %s", e)
+        if driver and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Page snapshot at failure: %s", utils.get_page_snapshot(driver))
         return False
+    
     except Exception as e:
-        logger.warning(f"Unexpected error filling field '{field_name}': {e}")
+        logger.error("Unexpected error during submission: %s", e)
+        if driver and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Page snapshot at failure: %s", utils.get_page_snapshot(driver))
+        recycle_driver = True
         return False
+    
+    finally:
+        # Return the browser to the pool, replacing it after an unexpected
+        # (possibly browser-level) error
+        pool.release(driver, discard=recycle_driver)
 
-def submit_form(
-    driver: uc.Chrome,
+async def submission_loop(
+    pool: BrowserPool,
     config: Dict[str, Any],
-    context: Dict[str, Any],
-    logger: logging.Logger
-) -> bool:
+    form: Mapping[str, Any],
+    url: str,
+    stats: Dict[str, int],
+    logger: logging.Logger,
+    start_delay: float = 0
+) -> None:
     """
-    Submit the form by clicking the submit button.
+    Submit the form repeatedly, waiting a random interval between submissions.
+    
+    The blocking Selenium work runs in the default executor so the wait between
+    submissions is a non-blocking asyncio.sleep, and several loops can share
+    one event loop.
     
     Args:
-        driver: Selenium WebDriver instance
+        pool: Browser pool to check WebDrivers out of
         config: Form configuration
-        context: Application context
+        form: Precomputed form data from prepare_form
+        url: Target URL
+        stats: Counters updated in place (submissions, successes, failures)
         logger: Logger instance
-    
-    Returns:
-        True if form was submitted successfully, False otherwise
+        start_delay: Seconds to wait before the first submission
     """
-    fields = config.get("fields", {})
-    submit_button = fields.get("submit_button", {})
-    
-    if not submit_button:
-        logger.warning("No submit button defined in configuration")
-        return False
+    # Get timing settings
+    min_interval = form["min_interval"]
+    max_interval = form["max_interval"]
+    submission_wait = form["submission_wait"]
     
-    selector = submit_button.get("selector")
-    selector_type = utils.get_selector_type(submit_button)
-    wait_time = utils.get_element_wait_time(context)
+    consecutive_failures = 0  # Track consecutive failures to avoid endless loops
+    max_consecutive_failures = 3
+    loop = asyncio.get_running_loop()
     
-    try:
-        # Wait for the submit button to be clickable
-        by_type = By.CSS_SELECTOR if selector_type == "css" else By.XPATH
-        wait = WebDriverWait(driver, wait_time)
-        button = wait.until(EC.element_to_be_clickable((by_type, selector)))
+    await asyncio.sleep(start_delay)
+    while True:
+        stats["submissions"] += 1
+        logger.info("Starting submission #%d", stats["submissions"])
         
-        # Click the button
-        button.click()
-        logger.info("Form submitted successfully")
-        return True
+        success = await loop.run_in_executor(None, submit_once, pool, config, form,
+                                             url, submission_wait, logger)
+        if success:
+            stats["successes"] += 1
+            consecutive_failures = 0  # Reset consecutive failures on success
+        else:
+            stats["failures"] += 1
+            consecutive_failures += 1
         
-    except (TimeoutException, NoSuchElementException) as e:
-        logger.warning(f"Could not find submit button: {e}")
-        return False
-    except (ElementNotInteractableException, StaleElementReferenceException) as e:
-        logger.warning(f"Could not interact with submit button: {e}")
-        return False
-    except Exception as e:
-        logger.warning(f"Unexpected error clicking submit button: {e}")
-        return False
+        # Log submission stats
+        logger.info("Submission stats - Total: %d, Success: %d, Failures: %d",
+                    stats["submissions"], stats["successes"], stats["failures"])
+        
+        # Check for too many consecutive failures
+        if consecutive_failures >= max_consecutive_failures:
+            # Back off exponentially (with jitter) while failures keep coming; the
+            # counter is only reset by a successful submission
+            backoff = min(60 * 2 ** min(consecutive_failures - max_consecutive_failures, 5), 1800)
+            backoff *= 0.8 + 0.4 * _RNG.random()
+            logger.error("Too many consecutive failures (%d). Pausing %d seconds for recovery.",
+                         consecutive_failures, backoff)
+            # Start over with a fresh browser after the pause
+            pool.discard_idle()
+            await asyncio.sleep(backoff)
+        
+        # Sleep before next submission
+        sleep_time = _RNG.randint(min_interval, max_interval)
+        if logger.isEnabledFor(logging.INFO):
+            next_time = time.strftime("%H:%M:%S", time.localtime(time.time() + sleep_time))
+            logger.info("Sleeping for %d seconds. Next submission at %s", sleep_time, next_time)
+        await asyncio.sleep(sleep_time)
 
 def run_submit_mode(context: Dict[str, Any]) -> None:
     """
@@ -179,12 +334,7 @@ def run_submit_mode(context: Dict[str, Any]) -> None:
     logger = context["logger"]
     
     logger.info("Starting form submission mode")
-    logger.info(f"Configuration: {config.get('name', 'default')}")
-    
-    # Get timing settings
-    timing_config = config.get("timing", {})
-    min_interval = timing_config.get("min_interval", 300)  # 5 minutes default
-    max_interval = timing_config.get("max_interval", 2700)  # 45 minutes default
+    logger.info("Configuration: %s", config.get("name", "default"))
     
     # Get target URL
     url = config.get("url")
@@ -193,134 +343,33 @@ def run_submit_mode(context: Dict[str, Any]) -> None:
         return
     
     # Initialize counters
-    submission_count = 0
-    success_count = 0
-    failure_count = 0
-    consecutive_failures = 0  # Track consecutive failures to avoid endless loops
-    max_consecutive_failures = 3
+    stats = {"submissions": 0, "successes": 0, "failures": 0}
     
-    try:
-        while True:
-            submission_count += 1
-            logger.info(f"Starting submission #{submission_count}")
-            
-            driver = None
-            try:
-                # Setup WebDriver with retry mechanism already built into utils.setup_driver
-                logger.info("Setting up WebDriver for submission")
-                driver = utils.setup_driver(config, logger)
-                
-                # Navigate to the form URL
-                logger.info(f"Navigating to {url}")
-                driver.get(url)
-                
-                # Wait for the page to load
-                time.sleep(3)
-                
-                # Get form fields from the configuration
-                fields = config.get("fields", {})
-                if not fields:
-                    logger.error("No form fields defined in the configuration")
-                    failure_count += 1
-                    consecutive_failures += 1
-                    continue
-                
-                # Log fields that will be filled
-                field_names = [name for name in fields.keys() if name != "submit_button"]
-                logger.info(f"Configuration defines {len(field_names)} fields to fill: {', '.join(field_names)}")
-                
-                # Fill form fields with random data (only those explicitly defined in config)
-                field_fill_count = 0
-                for field_name, field_info in fields.items():
-                    if field_name == "submit_button":
-                        continue
-                        
-                    logger.info(f"Filling field: {field_name}")
-                    success = utils.fill_field_with_random_data(driver, field_name, field_info, logger)
-                    if success:
-                        field_fill_count += 1
-                        logger.info(f"Successfully filled field: {field_name}")
-                    else:
-                        # Don't treat this as a critical error if the field is marked as not required
-                        if field_info.get("required", True):
-                            logger.warning(f"Failed to fill required field: {field_name}")
-                        else:
-                            logger.info(f"Skipped optional field: {field_name}")
-                
-                # Check if enough fields were filled
-                required_fields = sum(1 for f, info in fields.items() 
-                                     if f != "submit_button" and info.get("required", True))
-                
-                if field_fill_count == 0:
-                    logger.error("Failed to fill any fields, possible configuration issue")
-                    failure_count += 1
-                    consecutive_failures += 1
-                    continue
-                elif field_fill_count < required_fields:
-                    logger.warning(f"Filled only {field_fill_count} of {required_fields} required fields")
-                else:
-                    logger.info(f"Filled all {required_fields} required fields")
-                
-                # Find and click the submit button
-                submit_button = utils.find_submit_button(driver, config)
-                
-                if submit_button:
-                    logger.info("Found submit button, clicking...")
-                    submit_button.click()
-                    
-                    # Wait for submission to complete
-                    time.sleep(5)
-                    
-                    # Success!
-                    logger.info("Form submitted successfully")
-                    success_count += 1
-                    consecutive_failures = 0  # Reset consecutive failures on success
-                else:
-                    logger.error("Submit button not found")
-                    failure_count += 1
-                    consecutive_failures += 1
-                
-            except (TimeoutException, NoSuchElementException, 
-                    ElementNotInteractableException, StaleElementReferenceException) as e:
-                logger.error(f"Selenium error during submission: {str(e)}")
-                failure_count += 1
-                consecutive_failures += 1
-                
-            except Exception as e:
-                logger.error(f"Unexpected error during submission: {str(e)}")
-                failure_count += 1
-                consecutive_failures += 1
-            
-            finally:
-                # Close the browser
-                if driver:
-                    try:
-                        driver.quit()
-                        logger.info("Browser closed successfully")
-                    except Exception as e:
-                        logger.warning(f"Error closing browser: {str(e)}")
-                
-                # Log submission stats
-                logger.info(f"Submission stats - Total: {submission_count}, "
-                           f"Success: {success_count}, Failures: {failure_count}")
-                
-                # Check for too many consecutive failures
-                if consecutive_failures >= max_consecutive_failures:
-                    logger.error(f"Too many consecutive failures ({consecutive_failures}). Pausing for recovery.")
-                    # Longer pause for recovery
-                    time.sleep(60)
-                    consecutive_failures = 0
-                
-                # Sleep before next submission
-                sleep_time = random.randint(min_interval, max_interval)
-                next_time = time.strftime("%H:%M:%S", time.localtime(time.time() + sleep_time))
-                logger.info(f"Sleeping for {sleep_time} seconds. Next submission at {next_time}")
-                time.sleep(sleep_time)
+    # Resolve the per-form data once rather than on every submission
+    form = prepare_form(config)
     
+    # Number of submission loops running side by side, each with its own browser
+    parallelism = max(1, config.get("parallelism", 1))
+    
+    # Reuse browsers across submissions instead of cold-starting Chrome each time
+    pool = BrowserPool(config, logger, size=parallelism, warm_url=url)
+    atexit.register(pool.shutdown)
+    
+    async def run_loops() -> None:
+        # Stagger the extra loops so their submissions don't fire in lockstep
+        await asyncio.gather(*(
+            submission_loop(pool, config, form, url, stats, logger,
+                            start_delay=_RNG.uniform(0, form["min_interval"]) if worker else 0)
+            for worker in range(parallelism)
+        ))
+    
+    try:
+        asyncio.run(run_loops())
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt detected, stopping submissions")
     except Exception as e:
-        logger.error(f"Fatal error in submission loop: {str(e)}")
+        logger.error("Fatal error in submission loop: %s", e)
     finally:
-        logger.info(f"Form submission completed. Total submissions: {submission_count}, "
-                   f"Successful: {success_count}, Failed: {failure_count}") 
\ No newline at end of file
+        pool.shutdown()
+        logger.info("Form submission completed. Total submissions: %d, Successful: %d, Failed: %d",
+                    stats["submissions"], stats["successes"], stats["failures"]) 
@@ -1,24 +1,27 @@
 #!/usr/bin/env python3
 import logging
-import time
+import functools
+import html
 import random
 import re
 import json
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional, Tuple
 
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException, 
     NoSuchElementException,
     ElementNotInteractableException,
-    StaleElementReferenceException,
-    WebDriverException
+    StaleElementReferenceException
 )
 import undetected_chromedriver as uc
 import utils
+from browser_pool import BrowserPool
 
 # XSS Payloads organized by category
 XSS_PAYLOADS = {
@@ -52,42 +55,91 @@ XSS_PAYLOADS = {
         "<script>/* */alert(1)/* */</script>"
     ]
 }
+# Categories are only read (and shared by the worker threads), so freeze them
+XSS_PAYLOADS = MappingProxyType({category: tuple(payloads) for category, payloads in XSS_PAYLOADS.items()})
+_DEFAULT_CATEGORIES = tuple(XSS_PAYLOADS)
+# Every payload once, in category order: the plain payloads most likely to fire
+# come first, the filter-evasion variants last
+ALL_XSS_PAYLOADS = tuple(dict.fromkeys(
+    payload for payloads in XSS_PAYLOADS.values() for payload in payloads
+))
 
-# Patterns to detect XSS reflection in responses
-XSS_REFLECTION_PATTERNS = [
-    r"<script>alert\(1\)</script>",
-    r"<img src=x onerror=alert\(1\)>",
-    r"onmouseover=['\"]alert\(1\)['\"]",
-    r"onclick=['\"]alert\(1\)['\"]",
-    r"alert\(1\)",
-    r"javascript:alert"
-]
+# Most characters one special character can expand to when encoded (e.g. "&#x3c;", "\u003c")
+MAX_ENCODED_CHAR_LENGTH = 8
+_ALNUM_RUN_RE = re.compile(r"[A-Za-z0-9]+")
 
-def detect_xss_reflection(html_content: str, payload: str) -> bool:
+@functools.lru_cache(maxsize=256)
+def _compile_reflection_matcher(payload: str) -> Optional[re.Pattern]:
     """
-    Check if a given XSS payload is reflected in the HTML response.
+    Build a pattern matching a payload even after its special characters were encoded.
+    
+    The payload's alphanumeric runs, which encoders leave alone, are matched
+    literally (case-insensitively); each run of special characters between them
+    may be replaced by anything up to MAX_ENCODED_CHAR_LENGTH characters per
+    original character. The bounded gaps keep backtracking in check.
+    
+    Args:
+        payload: XSS payload
+        
+    Returns:
+        Compiled pattern, or None if the payload has no alphanumeric characters to anchor on
+    """
+    runs = list(_ALNUM_RUN_RE.finditer(payload))
+    if not runs:
+        return None
+    
+    parts = [runs[0].group()]
+    for previous, run in zip(runs, runs[1:]):
+        gap = run.start() - previous.end()
+        parts.append(f".{{0,{gap * MAX_ENCODED_CHAR_LENGTH}}}?")
+        parts.append(run.group())
+    return re.compile("".join(parts), re.IGNORECASE)
+
+@functools.lru_cache(maxsize=256)
+def _payload_variants(payload: str) -> Tuple[str, Optional[re.Pattern]]:
+    """
+    Get the forms a reflected payload is looked for in, computed once per payload.
+    
+    Args:
+        payload: XSS payload
+        
+    Returns:
+        Tuple of (payload as serialized in HTML text after escaping, encoded
+        reflection matcher or None)
+    """
+    return html.escape(payload, quote=False), _compile_reflection_matcher(payload)
+
+# Looks for a payload in the page inside the browser, so only the result crosses
+# the WebDriver connection. Receives the payload, its HTML-escaped form and the
+# source of its _compile_reflection_matcher pattern (or null); returns
+# [found verbatim, transformed reflection or null]
+REFLECTION_CHECK_SCRIPT = """
+const html = document.documentElement ? document.documentElement.outerHTML : '';
+if (html.includes(arguments[0])) return [true, null];
+if (html.includes(arguments[1])) return [false, arguments[1].slice(0, 200)];
+if (!arguments[2]) return [false, null];
+const match = html.match(new RegExp(arguments[2], 'i'));
+return [false, match ? match[0].slice(0, 200) : null];
+"""
+
+def check_reflection_in_browser(driver: uc.Chrome, payload: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check the current page for a payload without transferring the page source.
     
     Args:
-        html_content: HTML content to check
+        driver: Selenium WebDriver instance
         payload: XSS payload that was submitted
         
     Returns:
-        True if payload is reflected without sanitization, False otherwise
+        Tuple of (payload found verbatim, the payload as reflected with its
+        special characters encoded or altered, or None)
     """
-    # Check for exact payload reflection
-    if payload in html_content:
-        # Check if it's sanitized (e.g., HTML encoded)
-        sanitized_payload = payload.replace("<", "&lt;").replace(">", "&gt;")
-        if sanitized_payload in html_content and payload not in html_content:
-            return False
-        return True
-    
-    # Check for specific reflection patterns
-    for pattern in XSS_REFLECTION_PATTERNS:
-        if re.search(pattern, html_content):
-            return True
-            
-    return False
+    escaped, matcher = _payload_variants(payload)
+    result = driver.execute_script(REFLECTION_CHECK_SCRIPT, payload, escaped,
+                                   matcher.pattern if matcher else None)
+    if not isinstance(result, list) or len(result) != 2:
+        return False, None
+    return bool(result[0]), result[1] or None
 
 def test_form_field_xss(driver: uc.Chrome, field_info: Dict[str, Any], 
                         payload: str, logger: logging.Logger) -> Tuple[bool, str]:
@@ -134,6 +186,80 @@ def test_form_field_xss(driver: uc.Chrome, field_info: Dict[str, Any],
         logger.error(f"Error testing field with XSS payload: {str(e)}")
         return False, f"Error: {str(e)}"
 
+# Maximum seconds to wait for a submission to show an alert, navigate or reload
+SUBMISSION_WAIT = 2
+
+# Seconds a page reached by submitting gets after its load event to raise a
+# dialog from a timer or a late handler
+POST_LOAD_DIALOG_WAIT = 0.5
+
+# Restores every form on the page to its initial values so it can be reused for the next payload
+FORM_RESET_SCRIPT = "document.querySelectorAll('form').forEach(form => form.reset());"
+
+# Seconds between WebDriverWait checks (Selenium's default is 0.5); raise it
+# with xss_settings.poll_interval when the target server is struggling
+DEFAULT_POLL_INTERVAL = 0.1
+
+# Installed before every document loads (CDP Page.addScriptToEvaluateOnNewDocument):
+# replaces the dialog functions so a payload that calls them is recorded in
+# window.__xss_hits instead of opening a blocking dialog. Payloads that reach
+# alert() through eval or setTimeout strings are recorded the same way
+DIALOG_HOOK_SCRIPT = """
+window.__xss_hits = [];
+for (const name of ['alert', 'confirm', 'prompt']) {
+    window[name] = function (message) {
+        window.__xss_hits.push({fn: name, arg: String(message)});
+        return name === 'confirm' ? true : null;
+    };
+}
+"""
+
+# Fills the form and clicks submit in one round-trip. Receives the target field's
+# candidate CSS selectors, the payload, [candidate selectors, value] pairs for
+# the other required fields and the submit button's candidate selectors.
+# Returns [page URL before submitting, submit button], or null without touching
+# the page if any element is missing or is not a plain text control
+SUBMIT_PAYLOAD_SCRIPT = """
+const find = selectors => {
+    for (const selector of selectors) {
+        try {
+            const el = document.querySelector(selector);
+            if (el) return el;
+        } catch (e) {}
+    }
+    return null;
+};
+const isText = el => el && el.tagName !== 'SELECT' &&
+    !['checkbox', 'radio', 'hidden', 'file'].includes((el.type || '').toLowerCase());
+const setValue = (el, value) => {
+    el.focus();
+    Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+};
+const target = find(arguments[0]);
+const others = arguments[2].map(([selectors, value]) => [find(selectors), value]);
+const submit = find(arguments[3]);
+if (!isText(target) || !others.every(([el]) => isText(el)) || !submit || submit.disabled) return null;
+setValue(target, arguments[1]);
+others.forEach(([el, value]) => setValue(el, value));
+const url = location.href;
+submit.click();
+return [url, submit];
+"""
+
+# Returns and clears the dialog calls recorded by DIALOG_HOOK_SCRIPT
+READ_DIALOG_HITS_SCRIPT = "const hits = window.__xss_hits || []; window.__xss_hits = []; return hits;"
+
+# Browser settings for XSS testing. On top of the fast-load defaults (eager
+# page loads, no images or extensions) image and font requests are blocked;
+# stylesheets still load, since they decide which elements can be interacted with
+BROWSER_CONFIG = {
+    "name": "xss_test_browser",
+    "fast_page_load": True,
+    "block_assets": utils.IMAGE_AND_FONT_URLS,
+}
+
 def setup_browser() -> uc.Chrome:
     """
     Set up and configure the undetected Chrome browser.
@@ -144,13 +270,307 @@ def setup_browser() -> uc.Chrome:
     # Create a simple logger for this function
     logger = logging.getLogger(__name__)
     
-    # Create minimal config
-    config = {
-        "name": "xss_test_browser",
-    }
-    
     # Use the centralized setup_driver function from utils
-    return utils.setup_driver(config, logger)
+    return utils.setup_driver(dict(BROWSER_CONFIG), logger)
+
+@dataclass(frozen=True)
+class FieldTest:
+    """Everything needed to submit payloads into one field, shared by all its payloads."""
+    url: str
+    field_name: str
+    field_config: Dict[str, Any]
+    other_fields: List[Tuple[str, Dict[str, Any], List[str]]]  # from utils.get_required_other_fields
+    submit_button: Dict[str, Any]
+    wait_time: int
+    poll_interval: float = DEFAULT_POLL_INTERVAL  # seconds between WebDriverWait checks
+    # Candidate CSS selectors (utils.get_field_css_selectors) for the one-call submit
+    target_selectors: Tuple[str, ...] = ()
+    submit_selectors: Tuple[str, ...] = ()
+
+def _install_dialog_hook(driver: uc.Chrome, logger: logging.Logger) -> Optional[str]:
+    """
+    Make every page loaded from now on record dialog calls instead of showing them.
+    
+    Args:
+        driver: WebDriver instance
+        logger: Logger instance
+        
+    Returns:
+        Identifier of the installed script (for removal), or None if CDP is unavailable
+    """
+    result = utils.send_cdp_command(driver, "Page.addScriptToEvaluateOnNewDocument",
+                                    {"source": DIALOG_HOOK_SCRIPT}, logger=logger)
+    return result.get("identifier") if result else None
+
+def _has_dialog_hits(driver: uc.Chrome) -> bool:
+    """Wait condition: a hooked dialog function was called on the current page."""
+    return bool(driver.execute_script("return (window.__xss_hits || []).length > 0;"))
+
+def _page_loaded(driver: uc.Chrome) -> bool:
+    """Wait condition: the current document and its subresources finished loading."""
+    return driver.execute_script("return document.readyState;") == "complete"
+
+def _fill_and_submit(driver: uc.Chrome, test: FieldTest, element: Any, payload: str,
+                     logger: logging.Logger) -> Tuple[Optional[str], Any]:
+    """
+    Fill the form and click submit step by step through WebDriver.
+    
+    Args:
+        driver: WebDriver instance
+        test: Field under test
+        element: The field under test
+        payload: XSS payload
+        logger: Logger instance
+        
+    Returns:
+        Tuple of (page URL before submitting, clicked submit button), or
+        (None, None) if the submit button was not found
+    """
+    wait_time = test.wait_time
+    poll_interval = test.poll_interval
+    
+    element.clear()
+    element.send_keys(payload)
+    
+    # Fill other required fields with benign data in one script call, then
+    # fall back to WebDriver for any the script could not handle
+    filled = utils.fill_fields_via_script(
+        driver, [(selectors, "test data") for _, _, selectors in test.other_fields]
+    )
+    for (other_name, other_field, _), was_filled in zip(test.other_fields, filled):
+        if was_filled:
+            continue
+        try:
+            other_element = WebDriverWait(driver, wait_time, poll_frequency=poll_interval).until(
+                EC.presence_of_element_located((utils.get_selector_by(other_field), other_field["selector"]))
+            )
+            other_element.clear()
+            other_element.send_keys("test data")
+        except (TimeoutException, NoSuchElementException):
+            logger.warning(f"Could not find element for field '{other_name}'")
+    
+    # Submit the form
+    submit_button = test.submit_button
+    submit_selector = submit_button.get("selector")
+    by_submit_type = utils.get_selector_by(submit_button)
+    if not submit_selector:
+        return None, None
+    
+    try:
+        submit_btn = WebDriverWait(driver, wait_time, poll_frequency=poll_interval).until(
+            EC.element_to_be_clickable((by_submit_type, submit_selector))
+        )
+    except (TimeoutException, NoSuchElementException):
+        logger.warning("Could not find submit button")
+        return None, None
+    
+    prior_url = driver.current_url
+    submit_btn.click()
+    return prior_url, submit_btn
+
+def _test_single_payload(driver: uc.Chrome, test: FieldTest, payload: str, logger: logging.Logger,
+                         reload: bool = True, dialog_hook: bool = False) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Submit the form once with a payload in one field and look for signs of XSS.
+    
+    Args:
+        driver: WebDriver instance
+        test: Field under test
+        payload: XSS payload
+        logger: Logger instance
+        reload: Load the page first; if False the form left by the previous
+                payload is reset and reused
+        dialog_hook: DIALOG_HOOK_SCRIPT is installed, so dialogs are read from
+                     window.__xss_hits instead of switching to an alert
+        
+    Returns:
+        Tuple of (findings for this payload, whether the form is still on an
+        unchanged page and can be reused for the next payload)
+    """
+    url = test.url
+    field_name = test.field_name
+    wait_time = test.wait_time
+    poll_interval = test.poll_interval
+    selector = test.field_config.get("selector")
+    by_type = utils.get_selector_by(test.field_config)
+    findings = []
+    reusable = False
+    
+    try:
+        # Load the page (waiting for the field below replaces a fixed page-load
+        # sleep), or reset the form still shown after an in-place submission
+        if reload:
+            driver.get(url)
+        else:
+            driver.execute_script(FORM_RESET_SCRIPT)
+        
+        # Find the field (waiting for it also waits for the page to render)
+        wait = WebDriverWait(driver, wait_time, poll_frequency=poll_interval)
+        element = wait.until(EC.presence_of_element_located((by_type, selector)))
+        
+        # Fill the whole form and click submit in one round-trip when every
+        # element can be handled by script; dialogs must be hooked, since one
+        # opened by the click would abort the script call
+        submitted = None
+        if dialog_hook and test.target_selectors and test.submit_selectors:
+            submitted = driver.execute_script(
+                SUBMIT_PAYLOAD_SCRIPT, list(test.target_selectors), payload,
+                [[selectors, "test data"] for _, _, selectors in test.other_fields],
+                list(test.submit_selectors)
+            )
+        
+        navigated = False
+        if submitted:
+            prior_url, submit_btn = submitted
+        else:
+            prior_url, submit_btn = _fill_and_submit(driver, test, element, payload, logger)
+        
+        if submit_btn is not None:
+            # Wait for an alert, a navigation or a reload; responses rendered
+            # in place trigger none of them, so the wait is capped
+            try:
+                WebDriverWait(driver, SUBMISSION_WAIT, poll_frequency=poll_interval).until(EC.any_of(
+                    _has_dialog_hits if dialog_hook else EC.alert_is_present(),
+                    EC.url_changes(prior_url), EC.staleness_of(submit_btn)
+                ))
+                navigated = True
+            except TimeoutException:
+                pass
+        
+        # The wait above returns as soon as the new document exists, before
+        # handlers that run after DOMContentLoaded (img onerror, svg onload,
+        # timers) had a chance to fire; let the page finish loading first
+        dialog_present = _has_dialog_hits if dialog_hook else EC.alert_is_present()
+        if navigated and not dialog_present(driver):
+            try:
+                WebDriverWait(driver, SUBMISSION_WAIT, poll_frequency=poll_interval).until(
+                    EC.any_of(dialog_present, _page_loaded)
+                )
+                WebDriverWait(driver, POST_LOAD_DIALOG_WAIT, poll_frequency=poll_interval).until(dialog_present)
+            except TimeoutException:
+                pass
+        
+        # Check for signs of successful XSS
+        # 1. Look for alert dialogs (recorded by the hook, or an open native dialog)
+        if dialog_hook:
+            dialogs = [(hit.get('fn', 'alert'), hit.get('arg', ''))
+                       for hit in driver.execute_script(READ_DIALOG_HITS_SCRIPT) or []]
+        else:
+            try:
+                alert = driver.switch_to.alert
+                dialogs = [('alert', alert.text)]
+                alert.accept()
+            except Exception:
+                # No alert found, continue with other checks
+                dialogs = []
+        
+        for dialog, alert_text in dialogs:
+            logger.critical(f"POTENTIAL XSS VULNERABILITY DETECTED! {dialog}() dialog appeared with text: {alert_text}")
+            findings.append({
+                'field': field_name,
+                'payload': payload,
+                'type': 'alert',
+                'severity': 'critical',
+                'details': f"{dialog.capitalize()} dialog with text: {alert_text}",
+                'url': url
+            })
+        
+        # 2. Check if the payload appears unescaped in the page
+        found, reflected = check_reflection_in_browser(driver, payload)
+        if found:
+            logger.critical(f"POTENTIAL XSS VULNERABILITY DETECTED! Unescaped payload found in page source: {payload}")
+            findings.append({
+                'field': field_name,
+                'payload': payload,
+                'type': 'unescaped',
+                'severity': 'critical',
+                'details': "Payload found unescaped in page source",
+                'url': url
+            })
+        elif reflected:
+            # Usually the sanitization working, but it shows where (and how
+            # transformed) the input ends up, so it is reported at low severity
+            logger.warning(f"Payload reflected in transformed form in field '{field_name}': {reflected}")
+            findings.append({
+                'field': field_name,
+                'payload': payload,
+                'type': 'transformed',
+                'severity': 'low',
+                'details': f"Payload reflected with special characters encoded or altered: {reflected}",
+                'url': url
+            })
+        
+        # Reload after anything the payload left behind (a dialog, a navigation, its
+        # reflection) so it can't be attributed to the next payload. The capped
+        # wait above proves nothing about slow responses, so reuse also requires
+        # the page itself to be verifiably unchanged: same URL, same field
+        # element and no dialog recorded since the hits were read
+        reusable = (
+            not (navigated or findings or reflected)
+            and prior_url is not None and driver.current_url == prior_url
+            and not EC.staleness_of(element)(driver)
+            and not (dialog_hook and _has_dialog_hits(driver))
+        )
+        
+    except (TimeoutException, NoSuchElementException) as e:
+        logger.warning(f"Could not find element for field '{field_name}': {e}")
+    except (ElementNotInteractableException, StaleElementReferenceException) as e:
+        logger.warning(f"Could not interact with element for field '{field_name}': {e}")
+    except Exception as e:
+        logger.error(f"Error testing payload on field '{field_name}': {e}")
+    
+    return findings, reusable
+
+def _run_payloads(pool: BrowserPool, test: FieldTest, payloads: List[str], logger: logging.Logger,
+                  stop: threading.Event, stop_on_any: bool = False) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Test a batch of payloads on one browser checked out of the pool.
+    
+    The page is loaded once and only reloaded when a submission changed it;
+    forms answered in place are reset and reused for the next payload. While
+    the batch runs, the browser records dialog calls instead of opening them
+    (see DIALOG_HOOK_SCRIPT); the hook is removed before the browser goes back
+    to the pool.
+    
+    Args:
+        pool: Browser pool
+        test: Field under test
+        payloads: Payloads to submit, in order
+        logger: Logger instance
+        stop: Shared by the field's batches; once set, the remaining payloads
+              are skipped. Set here when a payload raises an alert (the field is
+              confirmed vulnerable), or on any finding above low severity if
+              stop_on_any is True
+        stop_on_any: Stop the field on any finding above low severity, not just an alert
+    
+    Returns:
+        Tuple of (number of payloads tested, findings)
+    """
+    tested = 0
+    findings = []
+    reload = True
+    driver = pool.acquire()
+    hook_id = _install_dialog_hook(driver, logger)
+    try:
+        for payload in payloads:
+            if stop.is_set():
+                break
+            tested += 1
+            logger.info(f"Testing payload on field '{test.field_name}': {payload}")
+            payload_findings, reusable = _test_single_payload(
+                driver, test, payload, logger, reload=reload, dialog_hook=hook_id is not None
+            )
+            findings.extend(payload_findings)
+            reload = not reusable
+            if any(f['type'] == 'alert' or (stop_on_any and f['severity'] != 'low') for f in payload_findings):
+                stop.set()
+    finally:
+        # A browser still carrying the hook would hide dialogs from its next user
+        unhooked = hook_id is None or utils.send_cdp_command(
+            driver, "Page.removeScriptToEvaluateOnNewDocument", {"identifier": hook_id}, logger=logger
+        ) is not None
+        pool.release(driver, discard=not unhooked)
+    return tested, findings
 
 def run_xss_mode(context: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -172,16 +592,27 @@ def run_xss_mode(context: Dict[str, Any]) -> Dict[str, Any]:
         return {"error": "No URL defined", "xss_vulnerabilities": []}
     
     logger.info(f"Starting XSS testing on URL: {url}")
-    logger.info(f"Using configuration: {json.dumps(config, indent=2)}")
+    # Serializing the whole config is only worth it when the message is emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Using configuration: %s", json.dumps(dict(config), indent=2))
     
     # Get XSS testing settings
     xss_settings = config.get("xss_settings", {})
     test_all_fields = xss_settings.get("test_all_fields", True)
     max_attempts_per_field = xss_settings.get("max_attempts_per_field", 0)  # 0 means test all payloads
-    payload_categories = xss_settings.get("payload_categories", list(XSS_PAYLOADS.keys()))
+    payload_categories = xss_settings.get("payload_categories", _DEFAULT_CATEGORIES)
+    parallel_browsers = max(1, xss_settings.get("parallel_browsers", 1))
+    poll_interval = xss_settings.get("poll_interval", DEFAULT_POLL_INTERVAL)
+    # Move on to the next field after its first finding of any kind (an alert always ends a field)
+    stop_on_first_field_vuln = xss_settings.get("stop_on_first_field_vuln", False) or not test_all_fields
     
-    # Set up the browser
-    driver = setup_browser()
+    # Payloads run on pooled browsers (the shared pool in comprehensive mode)
+    pool = context.get("driver_pool")
+    owns_pool = pool is None
+    if owns_pool:
+        block_assets = xss_settings.get("block_assets", BROWSER_CONFIG["block_assets"])
+        browser_config = dict(BROWSER_CONFIG, block_assets=block_assets)
+        pool = BrowserPool(browser_config, logger, size=parallel_browsers, warm_url=url)
     
     # Track results
     total_tests = 0
@@ -192,140 +623,63 @@ def run_xss_mode(context: Dict[str, Any]) -> Dict[str, Any]:
         fields = config.get("fields", {})
         text_fields = {name: field for name, field in fields.items() 
                       if name != "submit_button" and field.get("type") != "checkbox"}
+        submit_button = fields.get("submit_button", {})
+        wait_time = utils.get_element_wait_time(context)
         
-        for field_name, field_config in text_fields.items():
-            selector = field_config.get("selector")
-            selector_type = utils.get_selector_type(field_config)
-            wait_time = utils.get_element_wait_time(context)
-            
-            if not selector:
-                logger.warning(f"No selector defined for field '{field_name}', skipping")
-                continue
-            
-            logger.info(f"Testing field '{field_name}' with selector: {selector}")
-            
-            # Combine payloads from selected categories
-            payloads = []
-            for category in payload_categories:
-                if category in XSS_PAYLOADS:
-                    payloads.extend(XSS_PAYLOADS[category])
-            
-            # Limit number of payloads if max_attempts is set
-            if max_attempts_per_field > 0 and max_attempts_per_field < len(payloads):
-                payloads = random.sample(payloads, max_attempts_per_field)
-            
-            # Test each payload
-            for payload in payloads:
-                total_tests += 1
-                logger.info(f"Testing payload #{total_tests}: {payload}")
-                
-                # Load the page
-                driver.get(url)
-                time.sleep(2)  # Wait for page to load
+        # Combine payloads from selected categories (the same for every field),
+        # testing a payload listed in several categories only once
+        if set(payload_categories) >= XSS_PAYLOADS.keys():
+            all_payloads = ALL_XSS_PAYLOADS
+        else:
+            all_payloads = tuple(dict.fromkeys(payload for category in payload_categories
+                                               if category in XSS_PAYLOADS
+                                               for payload in XSS_PAYLOADS[category]))
+        
+        with ThreadPoolExecutor(max_workers=parallel_browsers) as executor:
+            for field_name, field_config in text_fields.items():
+                selector = field_config.get("selector")
                 
-                # Find and fill the field
-                by_type = By.CSS_SELECTOR if selector_type == "css" else By.XPATH
+                if not selector:
+                    logger.warning(f"No selector defined for field '{field_name}', skipping")
+                    continue
                 
-                try:
-                    wait = WebDriverWait(driver, wait_time)
-                    element = wait.until(EC.presence_of_element_located((by_type, selector)))
-                    element.clear()
-                    element.send_keys(payload)
-                    
-                    # Fill other required fields with benign data
-                    for other_name, other_field in fields.items():
-                        if other_name != field_name and other_name != "submit_button" and other_field.get("required", False):
-                            other_selector = other_field.get("selector")
-                            other_type = utils.get_selector_type(other_field)
-                            
-                            if not other_selector:
-                                continue
-                                
-                            by_other_type = By.CSS_SELECTOR if other_type == "css" else By.XPATH
-                            try:
-                                other_element = WebDriverWait(driver, wait_time).until(
-                                    EC.presence_of_element_located((by_other_type, other_selector))
-                                )
-                                other_element.clear()
-                                other_element.send_keys("test data")
-                            except (TimeoutException, NoSuchElementException):
-                                logger.warning(f"Could not find element for field '{other_name}'")
-                    
-                    # Submit the form
-                    submit_button = fields.get("submit_button", {})
-                    submit_selector = submit_button.get("selector")
-                    submit_type = utils.get_selector_type(submit_button)
-                    
-                    if submit_selector:
-                        by_submit_type = By.CSS_SELECTOR if submit_type == "css" else By.XPATH
-                        try:
-                            submit_btn = WebDriverWait(driver, wait_time).until(
-                                EC.element_to_be_clickable((by_submit_type, submit_selector))
-                            )
-                            submit_btn.click()
-                            time.sleep(2)  # Wait for form submission
-                        except (TimeoutException, NoSuchElementException):
-                            logger.warning("Could not find submit button")
-                    
-                    # Check for signs of successful XSS
-                    # 1. Look for alert dialog
-                    try:
-                        alert = driver.switch_to.alert
-                        alert_text = alert.text
-                        alert.accept()
-                        
-                        logger.critical(f"POTENTIAL XSS VULNERABILITY DETECTED! Alert dialog appeared with text: {alert_text}")
-                        xss_vulnerabilities.append({
-                            'field': field_name,
-                            'payload': payload,
-                            'type': 'alert',
-                            'details': f"Alert dialog with text: {alert_text}",
-                            'url': url
-                        })
-                        
-                    except Exception:
-                        # No alert found, continue with other checks
-                        pass
-                    
-                    # 2. Check if the payload appears unescaped in the page
-                    page_source = driver.page_source
-                    
-                    # Create regex pattern for detecting the payload in the source
-                    # This is a simple version and may need refinement
-                    escaped_payload = re.escape(payload)
-                    pattern = escaped_payload.replace(r'\<', '<').replace(r'\>', '>')
-                    
-                    if re.search(pattern, page_source):
-                        logger.critical(f"POTENTIAL XSS VULNERABILITY DETECTED! Unescaped payload found in page source: {payload}")
-                        xss_vulnerabilities.append({
-                            'field': field_name,
-                            'payload': payload,
-                            'type': 'unescaped',
-                            'details': "Payload found unescaped in page source",
-                            'url': url
-                        })
-                    
-                except (TimeoutException, NoSuchElementException) as e:
-                    logger.warning(f"Could not find element for field '{field_name}': {e}")
-                except (ElementNotInteractableException, StaleElementReferenceException) as e:
-                    logger.warning(f"Could not interact with element for field '{field_name}': {e}")
-                except Exception as e:
-                    logger.error(f"Error testing payload on field '{field_name}': {e}")
+                logger.info(f"Testing field '{field_name}' with selector: {selector}")
                 
-                # Brief pause between tests
-                time.sleep(1)
+                # Limit number of payloads if max_attempts is set (a new sample per
+                # field, kept in ranked order)
+                payloads = all_payloads
+                if max_attempts_per_field > 0 and max_attempts_per_field < len(payloads):
+                    payloads = tuple(payloads[i] for i in sorted(random.sample(range(len(payloads)),
+                                                                               max_attempts_per_field)))
                 
-            # Stop testing more fields if test_all_fields is False and we found something
-            if not test_all_fields and xss_vulnerabilities:
-                logger.info("Vulnerability found and test_all_fields is False. Stopping further tests.")
-                break
+                # Deal the payloads out so each worker keeps one browser for its
+                # batch and starts with the highest-ranked payloads
+                test = FieldTest(url, field_name, field_config, utils.get_required_other_fields(fields, field_name),
+                                 submit_button, wait_time, poll_interval,
+                                 tuple(utils.get_field_css_selectors(field_config)),
+                                 tuple(utils.get_field_css_selectors(submit_button)))
+                stop = threading.Event()
+                workers = min(parallel_browsers, len(payloads))
+                futures = [executor.submit(_run_payloads, pool, test, payloads[i::workers], logger,
+                                           stop, stop_on_first_field_vuln)
+                           for i in range(workers)]
+                for future in as_completed(futures):
+                    tested, findings = future.result()
+                    total_tests += tested
+                    xss_vulnerabilities.extend(findings)
+                    
+                # Stop testing more fields if test_all_fields is False and we found
+                # something (transformed reflections alone don't count)
+                if not test_all_fields and any(vuln['severity'] != 'low' for vuln in xss_vulnerabilities):
+                    logger.info("Vulnerability found and test_all_fields is False. Stopping further tests.")
+                    break
     
     except Exception as e:
         logger.error(f"Error during XSS testing: {e}")
     finally:
-        # Close the browser
-        driver.quit()
-        logger.info("Browser closed")
+        # Close the browsers (a shared pool is shut down by its owner)
+        if owns_pool:
+            pool.shutdown()
     
     # Generate report
     logger.info(f"XSS testing completed: {total_tests} tests executed")
@@ -342,6 +696,7 @@ def run_xss_mode(context: Dict[str, Any]) -> Dict[str, Any]:
             logger.critical(f"  Field: {vuln['field']}")
             logger.critical(f"  Payload: {vuln['payload']}")
             logger.critical(f"  Type: {vuln['type']}")
+            logger.critical(f"  Severity: {vuln['severity']}")
             logger.critical(f"  Details: {vuln['details']}")
             logger.critical(f"  URL: {vuln['url']}")
     else:
@@ -50,7 +50,8 @@ def count_issues_by_severity(results: Dict[str, Any]) -> Dict[str, int]:
         try:
             xss_vulns = xss_results.get("xss_vulnerabilities", []) or []
             for vuln in xss_vulns:
-                severity_counts["critical"] += 1
+                severity = vuln.get("severity", "critical")
+                severity_counts[severity] += 1
         except Exception as e:
             print(f"Error counting XSS vulnerabilities: {e}")
         
@@ -354,7 +355,7 @@ def generate_html_report(results: Dict[str, Any], target_url: str, output_path:
             markdown_content += f"* **Payload:** `{vuln.get('payload')}`\n"
             markdown_content += f"* **Type:** {vuln.get('type')}\n"
             markdown_content += f"* **Details:** {vuln.get('details')}\n"
-            markdown_content += "* **Severity:** Critical\n"
+            markdown_content += f"* **Severity:** {vuln.get('severity', 'critical').title()}\n"
             markdown_content += f"* **URL:** {vuln.get('url')}\n\n"
             markdown_content += """**Recommendation:** Implement proper output encoding and input validation. 
             Consider using a Content Security Policy (CSP) and modern frameworks that automatically escape output.\n\n"""
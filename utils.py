@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import functools
 import logging
 import random
 import os
@@ -8,9 +9,12 @@ import string
 import time
 import re
 import datetime
-from typing import Dict, Any, List, Optional, Union, Tuple
+from typing import Dict, Any, Callable, List, Optional, Union, Tuple
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
@@ -33,10 +37,14 @@ from selenium.common.exceptions import (
 # Default paths
 RANDOM_DATA_PATH = "random_data.json"
 
+@functools.lru_cache(maxsize=1)
 def load_random_data() -> Dict[str, Any]:
     """
     Load random data from random_data.json.
     
+    The file is parsed once per process; callers must treat the result as
+    read-only since it is shared.
+    
     Returns:
         Dictionary containing random data for name generation
     """
@@ -56,36 +64,42 @@ def load_random_data() -> Dict[str, Any]:
             }
         }
 
-def generate_name(name_type: str = "first") -> str:
+def generate_name(name_type: str = "first", rng: Optional[random.Random] = None) -> str:
     """
     Generate a random name.
     
     Args:
         name_type: Type of name to generate ("first" or "last")
+        rng: Random number generator to draw from (defaults to the global one)
     
     Returns:
         Random name
     """
+    rng = rng or random
     random_data = load_random_data()
     if name_type.lower() == "first":
-        return random.choice(random_data.get("first_names", ["John", "Jane"]))
+        return rng.choice(random_data.get("first_names", ["John", "Jane"]))
     else:
-        return random.choice(random_data.get("last_names", ["Smith", "Doe"]))
+        return rng.choice(random_data.get("last_names", ["Smith", "Doe"]))
 
-def generate_email() -> str:
+def generate_email(rng: Optional[random.Random] = None) -> str:
     """
     Generate a random email address.
     
+    Args:
+        rng: Random number generator to draw from (defaults to the global one)
+    
     Returns:
         Random email address
     """
+    rng = rng or random
     random_data = load_random_data()
-    first_name = generate_name("first").lower()
-    last_name = generate_name("last").lower()
-    domain = random.choice(random_data.get("email_domains", ["example.com"]))
+    first_name = generate_name("first", rng).lower()
+    last_name = generate_name("last", rng).lower()
+    domain = rng.choice(random_data.get("email_domains", ["example.com"]))
     
     # Add a random number for uniqueness
-    random_num = random.randint(1, 9999)
+    random_num = rng.randint(1, 9999)
     
     # Create email with different formats
     formats = [
@@ -95,18 +109,21 @@ def generate_email() -> str:
         f"{first_name}_{last_name}@{domain}"
     ]
     
-    return random.choice(formats)
+    return rng.choice(formats)
 
-def get_area_code(area_code_type: Optional[Union[str, List[str]]]) -> str:
+def get_area_code(area_code_type: Optional[Union[str, List[str]]],
+                  rng: Optional[random.Random] = None) -> str:
     """
     Get an area code based on the specified type.
     
     Args:
         area_code_type: Area code type (e.g., "canadian", "american") or list of types
+        rng: Random number generator to draw from (defaults to the global one)
     
     Returns:
         An area code string
     """
+    rng = rng or random
     random_data = load_random_data()
     area_codes = random_data.get("area_codes", {})
     
@@ -115,31 +132,34 @@ def get_area_code(area_code_type: Optional[Union[str, List[str]]]) -> str:
         if not area_code_type:  # Empty list
             area_code_type = "canadian"  # Default
         else:
-            area_code_type = random.choice(area_code_type)
+            area_code_type = rng.choice(area_code_type)
     
     # If no area code type specified or invalid type, default to canadian
     if not area_code_type or area_code_type not in area_codes:
         area_code_type = "canadian"
     
-    return random.choice(area_codes.get(area_code_type, ["416"]))
+    return rng.choice(area_codes.get(area_code_type, ["416"]))
 
-def generate_phone(area_code_type: Optional[Union[str, List[str]]] = None) -> str:
+def generate_phone(area_code_type: Optional[Union[str, List[str]]] = None,
+                   rng: Optional[random.Random] = None) -> str:
     """
     Generate a random phone number in the specified format.
     
     Args:
         area_code_type: Type of area code to use or list of types
+        rng: Random number generator to draw from (defaults to the global one)
     
     Returns:
         Random phone number as a string
     """
-    area_code = get_area_code(area_code_type)
-    exchange = random.randint(100, 999)
-    line = random.randint(1000, 9999)
+    rng = rng or random
+    area_code = get_area_code(area_code_type, rng)
+    exchange = rng.randint(100, 999)
+    line = rng.randint(1000, 9999)
     
     # Format based on area code type
     if isinstance(area_code_type, list):
-        selected_type = random.choice(area_code_type) if area_code_type else "canadian"
+        selected_type = rng.choice(area_code_type) if area_code_type else "canadian"
     else:
         selected_type = area_code_type or "canadian"
     
@@ -173,6 +193,25 @@ def get_selector_type(field_config: Dict[str, Any]) -> str:
     """
     return field_config.get("type", "css").lower()
 
+# Selenium locator strategy for each selector type name
+SELECTOR_BY = {
+    "css": By.CSS_SELECTOR,
+    "css_selector": By.CSS_SELECTOR,
+    "xpath": By.XPATH
+}
+
+def get_selector_by(field_config: Dict[str, Any]) -> str:
+    """
+    Get the Selenium locator strategy for a field's selector.
+
+    Args:
+        field_config: Field configuration dictionary
+
+    Returns:
+        Selenium By strategy (defaults to CSS selector)
+    """
+    return SELECTOR_BY.get(get_selector_type(field_config), By.CSS_SELECTOR)
+
 def get_element_wait_time(context: Dict[str, Any]) -> int:
     """
     Get the wait time for element presence/interaction.
@@ -221,35 +260,251 @@ def get_submission_interval(context: Dict[str, Any]) -> int:
     
     return random.randint(min_interval, max_interval)
 
-def generate_random_string(length: int = 8) -> str:
+def generate_random_string(length: int = 8, rng: Optional[random.Random] = None) -> str:
     """Generate a random alphanumeric string."""
+    rng = rng or random
     chars = string.ascii_letters + string.digits
-    return "".join(random.choice(chars) for _ in range(length))
+    return "".join(rng.choice(chars) for _ in range(length))
 
-def generate_address() -> str:
+def generate_address(rng: Optional[random.Random] = None) -> str:
     """Generate a random street address."""
-    number = str(random.randint(1, 9999))
-    street = random.choice(load_random_data().get("streets", ["Main St"]))
+    rng = rng or random
+    number = str(rng.randint(1, 9999))
+    street = rng.choice(load_random_data().get("streets", ["Main St"]))
     
     return f"{number} {street}"
 
-def generate_city() -> str:
+def generate_city(rng: Optional[random.Random] = None) -> str:
     """Generate a random city name."""
-    return random.choice(load_random_data().get("cities", ["New York"]))
+    rng = rng or random
+    return rng.choice(load_random_data().get("cities", ["New York"]))
 
-def generate_state() -> str:
+def generate_state(rng: Optional[random.Random] = None) -> str:
     """Generate a random state/province code."""
-    return random.choice(load_random_data().get("states", ["NY"]))
+    rng = rng or random
+    return rng.choice(load_random_data().get("states", ["NY"]))
 
-def generate_zip() -> str:
+def generate_zip(rng: Optional[random.Random] = None) -> str:
     """Generate a random ZIP/postal code."""
+    rng = rng or random
     # US format
-    if random.random() < 0.5:
-        return str(random.randint(10000, 99999))
+    if rng.random() < 0.5:
+        return str(rng.randint(10000, 99999))
     # Canadian format
     else:
         letters = string.ascii_uppercase
-        return f"{random.choice(letters)}{random.randint(0, 9)}{random.choice(letters)} {random.randint(0, 9)}{random.choice(letters)}{random.randint(0, 9)}"
+        return f"{rng.choice(letters)}{rng.randint(0, 9)}{rng.choice(letters)} {rng.randint(0, 9)}{rng.choice(letters)}{rng.randint(0, 9)}"
+
+# Chrome flags that skip work a form run never needs (images, extensions, sync)
+FAST_LOAD_ARGUMENTS = (
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+)
+
+# Content settings: 2 = block
+FAST_LOAD_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+
+def apply_fast_load_options(chrome_options: Any, config: Dict[str, Any]) -> None:
+    """
+    Configure Chrome to return from page loads as early as possible.
+    
+    Uses the "eager" page load strategy (return after DOMContentLoaded) and
+    blocks images and notifications. Disabled with "fast_page_load": false.
+    
+    Args:
+        chrome_options: ChromeOptions instance (Selenium or undetected_chromedriver)
+        config: Configuration dictionary
+    """
+    if not config.get("fast_page_load", True):
+        return
+    
+    chrome_options.page_load_strategy = "eager"
+    chrome_options.add_experimental_option("prefs", FAST_LOAD_PREFS)
+    for argument in FAST_LOAD_ARGUMENTS:
+        chrome_options.add_argument(argument)
+
+# Locations checked for a pinned chromedriver binary inside Docker
+CHROMEDRIVER_PATHS = (
+    "/usr/local/bin/chromedriver",
+    "/usr/bin/chromedriver",
+    "/opt/chromedriver",
+)
+
+@functools.lru_cache(maxsize=1)
+def is_running_in_docker() -> bool:
+    """
+    Detect whether the process runs inside a Docker container (checked once).
+    
+    Returns:
+        True if running in Docker, False otherwise
+    """
+    if os.environ.get("DOCKER_CONTAINER") == "true" or os.path.exists("/.dockerenv"):
+        return True
+    try:
+        with open("/proc/1/cgroup", "r") as f:
+            return "docker" in f.read()
+    except OSError:
+        return False
+
+@functools.lru_cache(maxsize=1)
+def find_chromedriver_path() -> Optional[str]:
+    """
+    Find a pinned chromedriver binary (looked up once per process).
+    
+    Returns:
+        Path to chromedriver, or None to let Selenium locate it
+    """
+    for path in CHROMEDRIVER_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+def create_http_session(pool_connections: int = 16, pool_maxsize: int = 32, retries: int = 0,
+                        user_agent: Optional[str] = None) -> requests.Session:
+    """
+    Create a requests session with a pooled, keep-alive connection adapter.
+    
+    Args:
+        pool_connections: Number of host pools to cache
+        pool_maxsize: Maximum connections kept per host
+        retries: Number of retries for failed connections (with a short backoff);
+                 off by default so an unreachable host fails fast
+        user_agent: User-Agent sent with every request (requests' default if None)
+        
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=retries, backoff_factor=0.3) if retries else 0
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    return session
+
+# Process-wide session used when the context does not provide one
+_DEFAULT_HTTP_SESSION = None
+
+def get_http_session(context: Dict[str, Any]) -> requests.Session:
+    """
+    Get the HTTP session shared by the current run.
+    
+    Args:
+        context: Application context, optionally holding an "http_session"
+        
+    Returns:
+        The context's session, or a process-wide pooled session
+    """
+    global _DEFAULT_HTTP_SESSION
+    
+    session = context.get("http_session")
+    if session is not None:
+        return session
+    
+    if _DEFAULT_HTTP_SESSION is None:
+        config = context.get("config", {})
+        _DEFAULT_HTTP_SESSION = create_http_session(
+            retries=config.get("http_retries", 0),
+            user_agent=config.get("user_agent")
+        )
+    return _DEFAULT_HTTP_SESSION
+
+# Image and font requests; they never change which elements a form has or
+# whether they can be interacted with
+IMAGE_AND_FONT_URLS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.ttf",
+)
+
+# Request patterns blocked with "block_assets": true (fonts, stylesheets,
+# images and common trackers don't affect filling or submitting a form)
+BLOCKED_ASSET_URLS = IMAGE_AND_FONT_URLS + (
+    "*.css",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*",
+)
+
+def block_asset_requests(driver: uc.Chrome, config: Dict[str, Any], logger: logging.Logger) -> None:
+    """
+    Block static asset and tracker requests over CDP when "block_assets" is enabled.
+    
+    Off by default since blocking stylesheets changes which elements are
+    visible (and so clickable) on some forms. "block_assets" may also be a
+    list of URL patterns to block instead of BLOCKED_ASSET_URLS (e.g.
+    IMAGE_AND_FONT_URLS, which leaves stylesheets alone).
+    
+    Args:
+        driver: Selenium WebDriver instance
+        config: Configuration dictionary
+        logger: Logger instance
+    """
+    block_assets = config.get("block_assets", False)
+    if not block_assets:
+        return
+    blocked_urls = list(block_assets) if isinstance(block_assets, (list, tuple)) else list(BLOCKED_ASSET_URLS)
+    
+    if send_cdp_command(driver, "Network.enable", logger=logger) is None:
+        return
+    if send_cdp_command(driver, "Network.setBlockedURLs", {"urls": blocked_urls}, logger) is not None:
+        logger.debug("Blocking asset requests for this browser")
+
+# Default page-load and script timeouts in seconds (overridable with
+# timing.page_load_timeout / timing.script_timeout)
+PAGE_LOAD_TIMEOUT = 30
+SCRIPT_TIMEOUT = 30
+
+def configure_timeouts(driver: uc.Chrome, config: Dict[str, Any]) -> None:
+    """
+    Set the driver's page-load and script timeouts.
+    
+    No implicit wait is set: every lookup that should wait uses an explicit
+    WebDriverWait, and an implicit wait would make each missed find_element
+    (e.g. fallback selectors) block for its full duration.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        config: Configuration dictionary (timing.page_load_timeout and
+            timing.script_timeout override the defaults)
+    """
+    timing = config.get("timing", {})
+    driver.set_page_load_timeout(timing.get("page_load_timeout", PAGE_LOAD_TIMEOUT))
+    driver.set_script_timeout(timing.get("script_timeout", SCRIPT_TIMEOUT))
+
+def get_uc_driver_kwargs(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the optional uc.Chrome arguments that skip per-launch setup work.
+    
+    "chromedriver_path" points at an already patched chromedriver (patched on
+    first use, then reused as is) instead of downloading and patching a fresh
+    copy per browser, "chrome_version" pins the major version so the installed
+    Chrome need not be probed, and "user_data_dir" reuses one persistent profile
+    instead of creating a temporary one. A profile can only be open in one
+    browser at a time, so only set it with a browser pool of size 1.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        Keyword arguments for uc.Chrome
+    """
+    kwargs = {}
+    if config.get("chromedriver_path"):
+        kwargs["driver_executable_path"] = os.path.expanduser(config["chromedriver_path"])
+    if config.get("chrome_version"):
+        kwargs["version_main"] = int(config["chrome_version"])
+    if config.get("user_data_dir"):
+        user_data_dir = os.path.expanduser(config["user_data_dir"])
+        os.makedirs(user_data_dir, exist_ok=True)
+        kwargs["user_data_dir"] = user_data_dir
+    return kwargs
 
 def setup_driver(config: Dict[str, Any], logger: logging.Logger) -> uc.Chrome:
     """
@@ -265,12 +520,7 @@ def setup_driver(config: Dict[str, Any], logger: logging.Logger) -> uc.Chrome:
     logger.info("Setting up WebDriver...")
     
     try:
-        # Docker container detection (more robust)
-        in_docker = any([
-            os.environ.get("DOCKER_CONTAINER") == "true",
-            os.path.exists("/.dockerenv"),
-            os.path.exists("/proc/1/cgroup") and "docker" in open("/proc/1/cgroup", "r").read()
-        ])
+        in_docker = is_running_in_docker()
         
         # In Docker, use standard Selenium directly to avoid version issues
         if in_docker:
@@ -284,33 +534,30 @@ def setup_driver(config: Dict[str, Any], logger: logging.Logger) -> uc.Chrome:
             chrome_options.add_argument("--disable-dev-shm-usage")
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--window-size=1920,1080")
+            apply_fast_load_options(chrome_options, config)
             
             # Try to find chromedriver in common Docker locations
-            chromedriver_paths = [
-                "/usr/local/bin/chromedriver",
-                "/usr/bin/chromedriver",
-                "/opt/chromedriver"
-            ]
-            
-            for path in chromedriver_paths:
-                if os.path.exists(path):
-                    logger.info(f"Found chromedriver at {path}")
-                    service = Service(executable_path=path)
-                    driver = webdriver.Chrome(service=service, options=chrome_options)
-                    driver.implicitly_wait(10)
-                    driver.set_page_load_timeout(30)
-                    return driver
+            path = find_chromedriver_path()
+            if path:
+                logger.info(f"Found chromedriver at {path}")
+                service = Service(executable_path=path)
+                # keep_alive reuses one HTTP connection to chromedriver for every command
+                driver = webdriver.Chrome(service=service, options=chrome_options, keep_alive=True)
+                configure_timeouts(driver, config)
+                block_asset_requests(driver, config, logger)
+                return driver
             
             # If no specific path found, let Selenium find chromedriver
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.implicitly_wait(10)
-            driver.set_page_load_timeout(30)
+            driver = webdriver.Chrome(options=chrome_options, keep_alive=True)
+            configure_timeouts(driver, config)
+            block_asset_requests(driver, config, logger)
             return driver
             
         # Setup Chrome options for undetected_chromedriver (non-Docker)
         chrome_options = uc.ChromeOptions()
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
+        apply_fast_load_options(chrome_options, config)
         
         # Custom user agent if provided
         user_agent = config.get("user_agent")
@@ -321,6 +568,8 @@ def setup_driver(config: Dict[str, Any], logger: logging.Logger) -> uc.Chrome:
         if os.name == "nt":  # Windows
             chrome_options.add_argument("--disable-features=HeadlessMode")
         
+        driver_kwargs = get_uc_driver_kwargs(config)
+        
         # Initialize Chrome driver with retry logic
         max_attempts = 3
         last_error = None
@@ -328,12 +577,11 @@ def setup_driver(config: Dict[str, Any], logger: logging.Logger) -> uc.Chrome:
         for attempt in range(max_attempts):
             try:
                 logger.info(f"WebDriver creation attempt {attempt+1}/{max_attempts}")
-                driver = uc.Chrome(options=chrome_options)
+                driver = uc.Chrome(options=chrome_options, keep_alive=True, **driver_kwargs)
                 
-                # Configure timeouts
-                driver.implicitly_wait(10)
-                driver.set_page_load_timeout(30)
-                driver.set_script_timeout(30)
+                # Configure timeouts and request blocking
+                configure_timeouts(driver, config)
+                block_asset_requests(driver, config, logger)
                 
                 # Test the driver with a simple command
                 driver.execute_script("return navigator.userAgent")
@@ -353,7 +601,109 @@ def setup_driver(config: Dict[str, Any], logger: logging.Logger) -> uc.Chrome:
         logger.error(f"Failed to set up WebDriver: {str(e)}")
         raise
 
-def find_form_field(driver: uc.Chrome, field_id: Optional[str] = None, 
+def send_cdp_command(driver: uc.Chrome, command: str, params: Optional[Dict[str, Any]] = None,
+                     logger: Optional[logging.Logger] = None) -> Optional[Dict[str, Any]]:
+    """
+    Send a Chrome DevTools Protocol command through the WebDriver.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        command: CDP method name (e.g. "Network.clearBrowserCookies")
+        params: Command parameters
+        logger: Optional logger for failures
+        
+    Returns:
+        Command result, or None if the driver does not support CDP or the command failed
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return None
+    
+    try:
+        return driver.execute_cdp_cmd(command, params or {})
+    except Exception as e:
+        if logger:
+            logger.debug(f"CDP command {command} failed: {str(e)}")
+        return None
+
+def navigate(driver: uc.Chrome, url: str, config: Dict[str, Any], logger: logging.Logger) -> None:
+    """
+    Load a URL, optionally without waiting for the page load to finish.
+    
+    With "cdp_navigation": true the navigation is started through CDP
+    Page.navigate, which returns as soon as the document starts loading, so the
+    caller's explicit wait for the first element it needs is the only wait.
+    Falls back to driver.get when CDP is unavailable.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        url: URL to load
+        config: Configuration dictionary
+        logger: Logger instance
+        
+    Raises:
+        WebDriverException: If Chrome reports that the navigation failed
+    """
+    if config.get("cdp_navigation", False):
+        result = send_cdp_command(driver, "Page.navigate", {"url": url}, logger=logger)
+        if result is not None:
+            if result.get("errorText"):
+                raise WebDriverException(f"Navigation to {url} failed: {result['errorText']}")
+            return
+    driver.get(url)
+
+def get_page_snapshot(driver: uc.Chrome, max_chars: int = 1000) -> str:
+    """
+    Get a size-capped snapshot of the current page HTML for diagnostics.
+
+    The slice is taken inside the browser, so chromedriver never has to
+    serialize the whole document the way driver.page_source does.
+
+    Args:
+        driver: Selenium WebDriver instance
+        max_chars: Maximum number of characters to return
+
+    Returns:
+        The first max_chars characters of the page HTML, or an empty string
+    """
+    try:
+        snapshot = driver.execute_script(
+            "return document.documentElement ? "
+            "document.documentElement.outerHTML.slice(0, arguments[0]) : '';",
+            max_chars
+        )
+        return snapshot or ""
+    except Exception:
+        return ""
+
+# Poll quickly for elements and keep polling through transient re-renders
+POLL_FREQUENCY = 0.1
+IGNORED_WAIT_EXCEPTIONS = (StaleElementReferenceException,)
+
+# Tries for an element action before a re-rendering page is treated as an error
+STALE_RETRY_ATTEMPTS = 3
+
+def with_stale_retry(locate: Callable[[], Any], action: Callable[[Any], Any],
+                     attempts: int = STALE_RETRY_ATTEMPTS) -> Any:
+    """
+    Run an action on an element, locating it again if it went stale in between.
+    
+    Args:
+        locate: Returns a fresh reference to the element
+        action: Operation to perform on the element
+        attempts: Maximum number of tries
+    
+    Returns:
+        Whatever the action returned
+    """
+    for attempt in range(attempts):
+        element = locate()
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            if attempt == attempts - 1:
+                raise
+
+def find_form_field(driver: uc.Chrome, field_id: Optional[str] = None,
                    field_name: Optional[str] = None, selector: Optional[str] = None,
                    timeout: int = 10, logger: Optional[logging.Logger] = None) -> Optional[Any]:
     """
@@ -389,7 +739,7 @@ def find_form_field(driver: uc.Chrome, field_id: Optional[str] = None,
     if selector:
         try:
             logger.debug(f"Trying to find element by CSS selector: {selector}")
-            return WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+            return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
         except (TimeoutException, NoSuchElementException):
             logger.debug("Element not found by CSS selector")
     
@@ -397,7 +747,7 @@ def find_form_field(driver: uc.Chrome, field_id: Optional[str] = None,
     if field_name:
         try:
             logger.debug(f"Trying to find element by name: {field_name}")
-            return WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((By.NAME, field_name)))
+            return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(EC.element_to_be_clickable((By.NAME, field_name)))
         except (TimeoutException, NoSuchElementException):
             logger.debug("Element not found by name")
     
@@ -406,32 +756,33 @@ def find_form_field(driver: uc.Chrome, field_id: Optional[str] = None,
         try:
             logger.debug(f"Trying to find element by ID: {field_id}")
             # Using a shorter timeout (1 second) for ID lookups to avoid long waits
-            return WebDriverWait(driver, 1).until(EC.element_to_be_clickable((By.ID, field_id)))
+            return WebDriverWait(driver, 1, poll_frequency=POLL_FREQUENCY).until(EC.element_to_be_clickable((By.ID, field_id)))
         except (TimeoutException, NoSuchElementException):
             logger.debug("Element not found by ID")
     
-    # Step 4: Try more relaxed XPath lookups
-    selectors_to_try = []
-    
-    # First prioritize name-based XPath queries
+    # Step 4: Try more relaxed partial-match lookups, one CSS selector group per
+    # attribute so each costs a single WebDriver round-trip
+    selector_groups = []
+
+    # First prioritize name-based queries
     if field_name:
-        selectors_to_try.append(f"//input[contains(@name, '{field_name}')]")
-        selectors_to_try.append(f"//select[contains(@name, '{field_name}')]")
-        selectors_to_try.append(f"//textarea[contains(@name, '{field_name}')]")
-    
-    # Then try ID-based XPath queries
+        selector_groups.append(", ".join(
+            f"{tag}[name*='{field_name}']" for tag in ("input", "select", "textarea")
+        ))
+
+    # Then try ID-based queries
     if field_id:
-        selectors_to_try.append(f"//input[contains(@id, '{field_id}')]")
-        selectors_to_try.append(f"//select[contains(@id, '{field_id}')]")
-        selectors_to_try.append(f"//textarea[contains(@id, '{field_id}')]")
-    
-    for xpath in selectors_to_try:
+        selector_groups.append(", ".join(
+            f"{tag}[id*='{field_id}']" for tag in ("input", "select", "textarea")
+        ))
+
+    for css_group in selector_groups:
         try:
-            logger.debug(f"Trying to find element by XPath: {xpath}")
-            element = driver.find_element(By.XPATH, xpath)
-            if element:
-                return element
-        except NoSuchElementException:
+            logger.debug(f"Trying to find element by CSS selector group: {css_group}")
+            elements = driver.find_elements(By.CSS_SELECTOR, css_group)
+            if elements:
+                return elements[0]
+        except (NoSuchElementException, InvalidSelectorException):
             pass
     
     logger.debug("Failed to find element with any strategy")
@@ -487,8 +838,198 @@ def find_submit_button(driver: uc.Chrome, config: Dict[str, Any]) -> Optional[An
     
     return None
 
+def get_field_value_generator(field_name: str, field_info: Dict[str, Any],
+                              rng: Optional[random.Random] = None) -> Callable[[], str]:
+    """
+    Pick the random value generator for a text field based on hints in its name.
+    
+    Resolving the generator once lets callers that fill the same field
+    repeatedly skip the name matching on every value.
+    
+    Args:
+        field_name: Name of the field (from the configuration)
+        field_info: Field configuration dictionary
+        rng: Random number generator to draw from (defaults to the global one)
+        
+    Returns:
+        Zero-argument function returning a new value
+    """
+    field_name_lower = field_name.lower()
+    
+    if "first" in field_name_lower and "name" in field_name_lower:
+        return lambda: generate_name("first", rng)
+    elif "last" in field_name_lower and "name" in field_name_lower:
+        return lambda: generate_name("last", rng)
+    elif "name" in field_name_lower:
+        return lambda: f"{generate_name('first', rng)} {generate_name('last', rng)}"
+    elif "email" in field_name_lower:
+        return lambda: generate_email(rng)
+    elif "phone" in field_name_lower:
+        # Get area code type from field config, defaulting to "canadian"
+        area_code_type = field_info.get('area_code_type', 'canadian')
+        return lambda: generate_phone(area_code_type, rng)
+    elif "address" in field_name_lower:
+        return lambda: generate_address(rng)
+    elif "city" in field_name_lower:
+        return lambda: generate_city(rng)
+    elif "state" in field_name_lower or "province" in field_name_lower:
+        return lambda: generate_state(rng)
+    elif "zip" in field_name_lower or "postal" in field_name_lower:
+        return lambda: generate_zip(rng)
+    
+    # Generic text input
+    return lambda: generate_random_string(12, rng)
+
+def generate_field_value(field_name: str, field_info: Dict[str, Any],
+                         rng: Optional[random.Random] = None) -> str:
+    """
+    Generate a random value for a text field based on hints in its name.
+    
+    Args:
+        field_name: Name of the field (from the configuration)
+        field_info: Field configuration dictionary
+        rng: Random number generator to draw from (defaults to the global one)
+        
+    Returns:
+        Generated value
+    """
+    return get_field_value_generator(field_name, field_info, rng)()
+
+# Field types that need real clicks/Select handling instead of a value assignment
+NON_TEXT_FIELD_TYPES = ("select", "checkbox", "radio", "hidden")
+
+# Sets the value of several text fields in one round-trip. Receives a list of
+# [candidate CSS selectors, value] pairs and returns one success flag per pair;
+# anything that is missing or not a plain text control is reported as false.
+FILL_FIELDS_SCRIPT = """
+const results = [];
+for (const [selectors, value] of arguments[0]) {
+    let el = null;
+    for (const selector of selectors) {
+        try {
+            el = document.querySelector(selector);
+        } catch (e) {
+            el = null;
+        }
+        if (el) break;
+    }
+    const type = el ? (el.type || '').toLowerCase() : '';
+    if (!el || el.tagName === 'SELECT' || ['checkbox', 'radio', 'hidden', 'file'].includes(type)) {
+        results.push(false);
+        continue;
+    }
+    el.focus();
+    // Native setter, so value-tracking frameworks (React, Vue) see the change
+    Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    results.push(true);
+}
+return results;
+"""
+
+def get_field_css_selectors(field_info: Dict[str, Any]) -> List[str]:
+    """
+    Build CSS selectors for a field in the same order find_form_field tries them.
+    
+    Args:
+        field_info: Field configuration dictionary
+        
+    Returns:
+        List of CSS selectors (selector, then name, then id)
+    """
+    selectors = []
+    if field_info.get("selector") and get_selector_by(field_info) == By.CSS_SELECTOR:
+        selectors.append(field_info["selector"])
+    if field_info.get("name"):
+        selectors.append(f"[name='{field_info['name']}']")
+    if field_info.get("id"):
+        selectors.append(f"[id='{field_info['id']}']")
+    return selectors
+
+def get_required_other_fields(fields: Dict[str, Any], field_name: str) -> List[Tuple[str, Dict[str, Any], List[str]]]:
+    """
+    Collect the other required fields that must be filled while testing a field.
+    
+    Args:
+        fields: All field configurations of the form
+        field_name: Name of the field receiving the payloads
+        
+    Returns:
+        List of (name, field config, CSS selectors) tuples
+    """
+    return [
+        (other_name, other_field, get_field_css_selectors(other_field))
+        for other_name, other_field in fields.items()
+        if other_name != field_name and other_name != "submit_button"
+        and other_field.get("required", False) and other_field.get("selector")
+    ]
+
+def fill_fields_via_script(driver: uc.Chrome, entries: List[Tuple[List[str], str]]) -> List[bool]:
+    """
+    Fill several text fields with a single execute_script call.
+    
+    Setting the value directly and dispatching input/change events avoids one
+    WebDriver round-trip (plus simulated key events) per field.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        entries: List of (candidate CSS selectors, value) pairs
+        
+    Returns:
+        List of success flags, one per entry
+    """
+    if not entries:
+        return []
+    
+    try:
+        results = driver.execute_script(FILL_FIELDS_SCRIPT, [[selectors, value] for selectors, value in entries])
+    except Exception:
+        results = None
+    
+    if not isinstance(results, list) or len(results) != len(entries):
+        return [False] * len(entries)
+    return [bool(result) for result in results]
+
+# Elements that typically appear once a form submission has been processed
+SUBMISSION_RESULT_SELECTORS = ".success, .error, .thank-you"
+
+def wait_for_submission(driver: uc.Chrome, old_url: str, timeout: int = 5,
+                        result_selectors: str = SUBMISSION_RESULT_SELECTORS,
+                        submit_element: Optional[Any] = None) -> bool:
+    """
+    Wait until a submitted form navigates away or shows a result message.
+    
+    Args:
+        driver: Selenium WebDriver instance
+        old_url: URL of the page before the submit button was clicked
+        timeout: Maximum time to wait in seconds
+        result_selectors: CSS selector group for success/error messages
+        submit_element: Clicked submit button; the page reloading it (same-URL
+                        postback) also counts as a response
+        
+    Returns:
+        True if a response was detected, False if the wait timed out
+    """
+    def submitted(d: uc.Chrome) -> bool:
+        if d.current_url != old_url or d.find_elements(By.CSS_SELECTOR, result_selectors):
+            return True
+        if submit_element is not None:
+            try:
+                submit_element.is_enabled()
+            except StaleElementReferenceException:
+                return True
+        return False
+    
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(submitted)
+        return True
+    except TimeoutException:
+        return False
+
 def fill_field_with_random_data(driver: uc.Chrome, field_name: str, 
-                               field_info: Dict[str, Any], logger: logging.Logger) -> bool:
+                               field_info: Dict[str, Any], logger: logging.Logger,
+                               rng: Optional[random.Random] = None) -> bool:
     """
     Fill a form field with random data based on field type.
     
@@ -497,6 +1038,7 @@ def fill_field_with_random_data(driver: uc.Chrome, field_name: str,
         field_name: Name of the field (for logging)
         field_info: Field configuration dictionary
         logger: Logger instance
+        rng: Random number generator to draw from (defaults to the global one)
         
     Returns:
         True if successful, False otherwise
@@ -512,18 +1054,19 @@ def fill_field_with_random_data(driver: uc.Chrome, field_name: str,
         logger.warning(f"Field '{field_name}' has no selector information (id, name, or CSS selector)")
         return False
     
+    rng = rng or random
     field_id = field_info.get("id")
     field_type = field_info.get("type", "text")
     field_name_attr = field_info.get("name")
     field_selector = field_info.get("selector")
     
-    try:
+    def locate() -> Any:
         field_element = find_form_field(driver, field_id, field_name_attr, field_selector, logger=logger)
-        
         if not field_element:
-            logger.warning(f"Could not find field '{field_name}'")
-            return False
-        
+            raise NoSuchElementException(f"Could not find field '{field_name}'")
+        return field_element
+    
+    def fill(field_element: Any) -> bool:
         # Skip hidden fields
         if field_type == "hidden":
             return True
@@ -535,14 +1078,14 @@ def fill_field_with_random_data(driver: uc.Chrome, field_name: str,
             if options:
                 # Skip the first option if it looks like a placeholder
                 start_index = 1 if len(options) > 1 else 0
-                select.select_by_index(random.randint(start_index, len(options) - 1))
+                select.select_by_index(rng.randint(start_index, len(options) - 1))
             else:
                 logger.warning(f"No options found for select field '{field_name}'")
                 return False
             
         # For checkbox or radio buttons
         elif field_type in ["checkbox", "radio"]:
-            if not field_element.is_selected() and random.random() < 0.7:  # 70% chance to select
+            if not field_element.is_selected() and rng.random() < 0.7:  # 70% chance to select
                 field_element.click()
                 
         # For text input fields
@@ -550,40 +1093,22 @@ def fill_field_with_random_data(driver: uc.Chrome, field_name: str,
             # Clear existing value
             field_element.clear()
             
-            # Generate value based on field name hints
-            field_name_lower = field_name.lower()
-            value = ""
-            
-            if "first" in field_name_lower and "name" in field_name_lower:
-                value = generate_name("first")
-            elif "last" in field_name_lower and "name" in field_name_lower:
-                value = generate_name("last")
-            elif "name" in field_name_lower:
-                value = f"{generate_name('first')} {generate_name('last')}"
-            elif "email" in field_name_lower:
-                value = generate_email()
-            elif "phone" in field_name_lower:
-                # Get area code type from field config, defaulting to "canadian"
-                area_code_type = field_info.get('area_code_type', 'canadian')
-                value = generate_phone(area_code_type)
-            elif "address" in field_name_lower:
-                value = generate_address()
-            elif "city" in field_name_lower:
-                value = generate_city()
-            elif "state" in field_name_lower or "province" in field_name_lower:
-                value = generate_state()
-            elif "zip" in field_name_lower or "postal" in field_name_lower:
-                value = generate_zip()
-            else:
-                # Generic text input
-                value = generate_random_string(12)
+            value = generate_field_value(field_name, field_info, rng)
             
             # Send the value to the field
             field_element.send_keys(value)
             logger.debug(f"Filled field '{field_name}' with value: {value}")
         
         return True
-        
+    
+    try:
+        # Locate the field again if the page re-rendered it while we were filling it
+        return with_stale_retry(locate, fill)
+    
+    except NoSuchElementException:
+        logger.warning(f"Could not find field '{field_name}'")
+        return False
+    
     except Exception as e:
         logger.error(f"Error filling field '{field_name}': {str(e)}")
         return False